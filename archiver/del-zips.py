@@ -1,17 +1,28 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def del_zip(zip_dir: str):
+
+def _safe_remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def del_zip(zip_dir: str, max_workers: int = 32):
     start_range = 0
     end_range = 0xe7 #int(os.getenv("END_RANGE", "256"))
     print(
         f"Processing WAD archive from {start_range:02x} to {end_range-1:02x}")
-    for i in range(start_range, end_range):
-        zip_path = os.path.join(zip_dir, f"{i:02x}.zip")
-        print(f"Deleting {zip_path}...")
-        try:
-            os.remove(zip_path)
-        except FileNotFoundError:
-            print(f"Zip file {zip_path} does not exist. Skipping.")
+    paths = [os.path.join(zip_dir, f"{i:02x}.zip")
+             for i in range(start_range, end_range)]
+    # os.remove releases the GIL, so unlinks overlap on high-latency mounts.
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        removed = list(ex.map(_safe_remove, paths))
+    deleted = sum(removed)
+    print(f"Deleted {deleted} zip files from {zip_dir}, "
+          f"{len(paths) - deleted} did not exist.")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
-from tempfile import TemporaryDirectory
 import requests
 import os
 import subprocess
 import shutil
 import sys
+import threading
 import time
 
 BASE_URL = 'https://archive.org/download/wadarchive/DATA'
@@ -35,84 +35,102 @@ def _fmt_eta(seconds: float) -> str:
     return f"{m:02d}:{s:02d}"
 
 
+def _report_progress(fd: int, filename: str, total_bytes, stop: threading.Event,
+                     min_print_interval: float = 0.25):
+    start = time.monotonic()
+    last_print = start
+    last_bytes = 0
+    while not stop.wait(min_print_interval):
+        # The fd's offset, not its size: the file may be preallocated.
+        downloaded = os.lseek(fd, 0, os.SEEK_CUR)
+        now = time.monotonic()
+        elapsed = now - start
+        inst_bps = (downloaded - last_bytes) / max(now - last_print, 1e-9)
+        avg_bps = downloaded / max(elapsed, 1e-9)
+
+        if total_bytes:
+            pct = (downloaded / total_bytes) * 100.0
+            remaining = total_bytes - downloaded
+            eta = remaining / max(avg_bps, 1e-9)
+            line = (
+                f"\r{filename}  "
+                f"{pct:6.2f}%  "
+                f"{_fmt_bytes(downloaded)}/{_fmt_bytes(total_bytes)}  "
+                f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}  "
+                f"ETA {_fmt_eta(eta)}"
+            )
+        else:
+            line = (
+                f"\r{filename}  "
+                f"{_fmt_bytes(downloaded)}  "
+                f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}"
+            )
+        print(line, flush=True)
+        last_print = now
+        last_bytes = downloaded
+
+
 def download_zip(i: int, zip_path: str):
     prefix = f"{i:02x}"
     filename = f"{prefix}.zip"
     if os.path.exists(zip_path):
         print(f"File {zip_path} already exists. Skipping download.")
         return
-    with TemporaryDirectory() as tmp_dir:
-        tmp_path = os.path.join(tmp_dir, filename + ".part")
-        url = f"{BASE_URL}/{filename}"
-        print(f"Downloading {url} -> {tmp_path}")
-        # Make requests a bit more robust and keep connections reused
-        with requests.Session() as session:
-            with session.get(url, stream=True, timeout=(10, 60)) as r:
-                r.raise_for_status()
-
-                total = r.headers.get("Content-Length")
-                total_bytes = int(total) if total and total.isdigit() else None
-
-                downloaded = 0
-                start = time.monotonic()
-                last_print = start
-                last_bytes = 0
-
-                # tune these if you want
-                chunk_size = 1024 * 256  # 256KB
-                min_print_interval = 0.15  # seconds
-
-                with open(tmp_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=chunk_size):
-                        if not chunk:
-                            continue
-                        f.write(chunk)
-                        downloaded += len(chunk)
-
-                        now = time.monotonic()
-                        if now - last_print >= min_print_interval:
-                            elapsed = now - start
-                            inst_bps = (downloaded - last_bytes) / \
-                                max(now - last_print, 1e-9)
-                            avg_bps = downloaded / max(elapsed, 1e-9)
-
-                            if total_bytes:
-                                pct = (downloaded / total_bytes) * 100.0
-                                remaining = total_bytes - downloaded
-                                eta = remaining / max(avg_bps, 1e-9)
-                                line = (
-                                    f"\r{filename}  "
-                                    f"{pct:6.2f}%  "
-                                    f"{_fmt_bytes(downloaded)}/{_fmt_bytes(total_bytes)}  "
-                                    f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}  "
-                                    f"ETA {_fmt_eta(eta)}"
-                                )
-                            else:
-                                line = (
-                                    f"\r{filename}  "
-                                    f"{_fmt_bytes(downloaded)}  "
-                                    f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}"
-                                )
-                            print(line, flush=True)
-                            last_print = now
-                            last_bytes = downloaded
-
-                # final print line + newline
-                end = time.monotonic()
-                elapsed = end - start
-                avg_bps = downloaded / max(elapsed, 1e-9)
+    # Download next to the destination so it can be swapped in atomically.
+    tmp_path = zip_path + ".part"
+    url = f"{BASE_URL}/{filename}"
+    print(f"Downloading {url} -> {tmp_path}")
+    # Make requests a bit more robust and keep connections reused
+    with requests.Session() as session:
+        with session.get(url, stream=True, timeout=(10, 60)) as r:
+            r.raise_for_status()
+
+            total = r.headers.get("Content-Length")
+            total_bytes = int(total) if total and total.isdigit() else None
+
+            with open(tmp_path, "wb", buffering=1024 * 1024) as f:
                 if total_bytes:
-                    sys.stdout.write(
-                        f"\r{filename}  100.00%  "
-                        f"{_fmt_bytes(downloaded)}/{_fmt_bytes(total_bytes)}  "
-                        f"avg {_fmt_rate(avg_bps)}  ETA 00:00\n"
-                    )
-                else:
-                    sys.stdout.write(
-                        f"\r{filename}  {_fmt_bytes(downloaded)}  avg {_fmt_rate(avg_bps)}\n")
-                sys.stdout.flush()
-        shutil.move(tmp_path, zip_path)
-        print(f"Downloaded {zip_path}")
+                    # Reserve the whole extent up front so the file isn't
+                    # grown (and fragmented) one write at a time.
+                    try:
+                        os.posix_fallocate(f.fileno(), 0, total_bytes)
+                    except (AttributeError, OSError):
+                        pass
+                stop = threading.Event()
+                reporter = threading.Thread(
+                    target=_report_progress,
+                    args=(f.fileno(), filename, total_bytes, stop),
+                    daemon=True,
+                )
+                start = time.monotonic()
+                reporter.start()
+                try:
+                    # Let the C-level copy loop move the body in 1MB
+                    # reads; progress is sampled from the file offset.
+                    r.raw.decode_content = True
+                    shutil.copyfileobj(r.raw, f, length=1024 * 1024)
+                finally:
+                    stop.set()
+                    reporter.join()
+                downloaded = f.tell()
+                f.truncate(downloaded)  # drop any preallocated tail
+
+            # final print line + newline
+            end = time.monotonic()
+            elapsed = end - start
+            avg_bps = downloaded / max(elapsed, 1e-9)
+            if total_bytes:
+                sys.stdout.write(
+                    f"\r{filename}  100.00%  "
+                    f"{_fmt_bytes(downloaded)}/{_fmt_bytes(total_bytes)}  "
+                    f"avg {_fmt_rate(avg_bps)}  ETA 00:00\n"
+                )
+            else:
+                sys.stdout.write(
+                    f"\r{filename}  {_fmt_bytes(downloaded)}  avg {_fmt_rate(avg_bps)}\n")
+            sys.stdout.flush()
+    os.replace(tmp_path, zip_path)
+    print(f"Downloaded {zip_path}")
 
 
 def move_files(dir: str,
@@ -152,18 +170,15 @@ def rename_dirs(tmp_dir: str, id: str):
     38-character names are renamed by adding the given prefix.
     Any other name length raises an error.
     """
-    entries = os.listdir(tmp_dir)
-    for entry in entries:
-        print(f"  Entry: '{entry}'")
-        entry = str(entry.strip())
-        if len(entry) != 38:
-            continue
-        new_entry = id + entry
-        old_path = os.path.join(tmp_dir, entry)
-        new_path = os.path.join(tmp_dir, new_entry)
-        print(f"Renaming {entry} to {new_entry}")
-        shutil.move(old_path, new_path)
-        print(f"Moved {old_path} to {new_path}")
+    renamed = 0
+    with os.scandir(tmp_dir) as it:
+        for entry in it:
+            name = entry.name.strip()
+            if len(name) != 38:
+                continue
+            shutil.move(entry.path, os.path.join(tmp_dir, id + name))
+            renamed += 1
+    print(f"Renamed {renamed} entries in {tmp_dir} with prefix {id}")
 
 
 def download_and_process_zip(i: int, tmp_dir: str, out_dir: str):
@@ -1,12 +1,89 @@
+import boto3
+import io
 import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
-import subprocess
+import queue
+import struct
 import shutil
 import sys
+import threading
 import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 BASE_URL = 'https://archive.org/download/wadarchive/DATA'
 
+# Concurrency per pipeline stage (download -> unzip -> upload).
+DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", "4"))
+UNZIP_WORKERS = int(os.getenv("UNZIP_WORKERS", "2"))
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "4"))
+# Threads inflating members of a single zip.
+UNZIP_THREADS = int(os.getenv("UNZIP_THREADS", str(os.cpu_count() or 4)))
+
+# Parallel byte-range connections per zip download.
+DOWNLOAD_CONNECTIONS = int(os.getenv("DOWNLOAD_CONNECTIONS", "8"))
+# Cap on HTTP connections in flight across all downloads, so DOWNLOAD_WORKERS
+# can be raised to overlap more zips without opening workers x connections.
+MAX_CONNECTIONS = int(os.getenv(
+    "MAX_CONNECTIONS", str(DOWNLOAD_WORKERS * DOWNLOAD_CONNECTIONS)))
+# Don't split a download into ranges smaller than this.
+MIN_RANGE_BYTES = 8 * 1024 * 1024
+# Socket reads are this size; they're buffered and written out with a single
+# gather-write once WRITE_BATCH_BYTES have accumulated.
+READ_CHUNK_BYTES = 4 * 1024 * 1024
+WRITE_BATCH_BYTES = 16 * 1024 * 1024
+
+# Inflate zip members straight from ranged GETs instead of downloading the
+# whole zip first (falls back to downloading if the server can't do ranges).
+STREAM_EXTRACT = os.getenv("STREAM_EXTRACT", "1") != "0"
+STREAM_CHUNK_BYTES = 1024 * 1024
+
+# Don't start another download unless this much disk is free.
+MIN_FREE_BYTES = int(os.getenv("MIN_FREE_GB", "20")) * 1024 * 1024 * 1024
+
+# Zips past the free-space gate whose files are still on disk. Only they can
+# give space back, so with none left a waiting download would wait forever.
+_ACTIVE_IDS = set()
+_ACTIVE_LOCK = threading.Lock()
+
+# Shared by every download so TCP/TLS connections to archive.org are reused
+# across zips. Every GET holds one of _CONNECTION_SLOTS while it streams.
+_SESSION = requests.Session()
+_CONNECTION_SLOTS = threading.BoundedSemaphore(MAX_CONNECTIONS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=max(16, MAX_CONNECTIONS),
+    max_retries=Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[500, 502, 503, 504]),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# Files of one extracted zip uploaded in parallel; upload_file is
+# thread-safe so they all share one long-lived client.
+UPLOAD_THREADS = int(os.getenv("UPLOAD_THREADS", "32"))
+# The defaults (8MB parts, 10 threads per file) are far too conservative.
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=50,
+    use_threads=True,
+)
+
+# Present in an extract dir while extraction is still in progress.
+INCOMPLETE_SENTINEL = ".incomplete"
+
+# Zip local file header; fields 10 and 11 are the name and extra lengths.
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+_STOP = object()
+
 
 def _fmt_bytes(n: float) -> str:
     units = ["B", "KB", "MB", "GB", "TB"]
@@ -34,6 +111,234 @@ def _fmt_eta(seconds: float) -> str:
     return f"{m:02d}:{s:02d}"
 
 
+class _Progress:
+    """
+    Thread-safe byte counter for a download. A background thread prints the
+    progress line so the workers writing data never format or print. A
+    single reader may assign `downloaded` directly instead of calling add().
+    """
+
+    def __init__(self, filename: str, total_bytes: Optional[int],
+                 min_print_interval: float = 0.25):
+        self.filename = filename
+        self.total_bytes = total_bytes
+        self.min_print_interval = min_print_interval
+        self.downloaded = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._report, daemon=True)
+
+    def add(self, n: int):
+        with self._lock:
+            self.downloaded += n
+
+    def __enter__(self) -> "_Progress":
+        self.start = time.monotonic()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        if exc[0] is None:
+            self._print_final()
+
+    def _report(self):
+        last_print = self.start
+        last_bytes = 0
+        while not self._stop.wait(self.min_print_interval):
+            now = time.monotonic()
+            downloaded = self.downloaded
+            elapsed = now - self.start
+            inst_bps = (downloaded - last_bytes) / max(now - last_print, 1e-9)
+            avg_bps = downloaded / max(elapsed, 1e-9)
+            if self.total_bytes:
+                pct = (downloaded / self.total_bytes) * 100.0
+                remaining = self.total_bytes - downloaded
+                eta = remaining / max(avg_bps, 1e-9)
+                line = (
+                    f"\r{self.filename}  "
+                    f"{pct:6.2f}%  "
+                    f"{_fmt_bytes(downloaded)}/{_fmt_bytes(self.total_bytes)}  "
+                    f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}  "
+                    f"ETA {_fmt_eta(eta)}"
+                )
+            else:
+                line = (
+                    f"\r{self.filename}  "
+                    f"{_fmt_bytes(downloaded)}  "
+                    f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}"
+                )
+            print(line, flush=True)
+            last_print = now
+            last_bytes = downloaded
+
+    def _print_final(self):
+        elapsed = time.monotonic() - self.start
+        avg_bps = self.downloaded / max(elapsed, 1e-9)
+        if self.total_bytes:
+            sys.stdout.write(
+                f"\r{self.filename}  100.00%  "
+                f"{_fmt_bytes(self.downloaded)}/{_fmt_bytes(self.total_bytes)}  "
+                f"avg {_fmt_rate(avg_bps)}  ETA 00:00\n"
+            )
+        else:
+            sys.stdout.write(
+                f"\r{self.filename}  {_fmt_bytes(self.downloaded)}  avg {_fmt_rate(avg_bps)}\n")
+        sys.stdout.flush()
+
+
+def _probe_ranges(session: requests.Session, url: str) -> Tuple[str, Optional[int]]:
+    """
+    Returns the final (post-redirect) URL and the content length if the server
+    supports byte ranges, otherwise None for the length.
+    """
+    r = session.head(url, allow_redirects=True, timeout=(10, 60))
+    r.raise_for_status()
+    total = r.headers.get("Content-Length")
+    if r.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return r.url, None
+    return r.url, int(total) if total and total.isdigit() else None
+
+
+def _split_ranges(total_bytes: int, n: int) -> List[Tuple[int, int]]:
+    n = max(1, min(n, total_bytes // MIN_RANGE_BYTES))
+    step = -(-total_bytes // n)
+    return [(a, min(a + step, total_bytes) - 1) for a in range(0, total_bytes, step)]
+
+
+def _preallocate(fd: int, size: int):
+    """
+    Reserves the file's extents up front so multi-GB zips aren't grown (and
+    fragmented) one write at a time. Best effort: not every OS/filesystem
+    supports it.
+    """
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        pass
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int):
+    view = memoryview(data)
+    while view:
+        n = os.pwrite(fd, view, offset)
+        view = view[n:]
+        offset += n
+
+
+def _pwritev_all(fd: int, bufs: List[bytes], offset: int) -> int:
+    # One gather-write for the whole batch; finish off any short write.
+    total = sum(len(b) for b in bufs)
+    n = os.pwritev(fd, bufs, offset)
+    if n < total:
+        _pwrite_all(fd, b"".join(bufs)[n:], offset + n)
+    return total
+
+
+def _download_range(session: requests.Session, url: str, fd: int,
+                    start: int, end: int, progress: _Progress):
+    headers = {"Range": f"bytes={start}-{end}"}
+    with _CONNECTION_SLOTS, \
+            session.get(url, headers=headers, stream=True, timeout=(10, 60)) as r:
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise RuntimeError(f"Server ignored Range request for {url}")
+        offset = start
+        pending: List[bytes] = []
+        pending_bytes = 0
+        for chunk in r.iter_content(chunk_size=READ_CHUNK_BYTES):
+            if not chunk:
+                continue
+            pending.append(chunk)
+            pending_bytes += len(chunk)
+            progress.add(len(chunk))
+            if pending_bytes >= WRITE_BATCH_BYTES:
+                offset += _pwritev_all(fd, pending, offset)
+                pending = []
+                pending_bytes = 0
+        if pending:
+            offset += _pwritev_all(fd, pending, offset)
+    if offset != end + 1:
+        raise RuntimeError(
+            f"Short read for bytes={start}-{end} of {url}: got {offset - start} bytes")
+
+
+def _download_ranged(session: requests.Session, url: str, fd: int,
+                     total_bytes: int, filename: str):
+    ranges = _split_ranges(total_bytes, DOWNLOAD_CONNECTIONS)
+    _preallocate(fd, total_bytes)
+    with _Progress(filename, total_bytes) as progress:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+            futures = [ex.submit(_download_range, session, url, fd, a, b, progress)
+                       for a, b in ranges]
+            for fut in futures:
+                fut.result()
+
+
+def _download_stream(session: requests.Session, url: str, fd: int, filename: str):
+    with _CONNECTION_SLOTS, session.get(url, stream=True, timeout=(10, 60)) as r:
+        r.raise_for_status()
+
+        total = r.headers.get("Content-Length")
+        total_bytes = int(total) if total and total.isdigit() else None
+
+        downloaded = 0
+        written = 0
+        if total_bytes:
+            _preallocate(fd, total_bytes)
+        pending: List[bytes] = []
+        with _Progress(filename, total_bytes) as progress:
+            for chunk in r.iter_content(chunk_size=READ_CHUNK_BYTES):
+                if not chunk:
+                    continue
+                pending.append(chunk)
+                downloaded += len(chunk)
+                progress.downloaded = downloaded
+                if downloaded - written >= WRITE_BATCH_BYTES:
+                    written += _pwritev_all(fd, pending, written)
+                    pending = []
+            if pending:
+                written += _pwritev_all(fd, pending, written)
+
+
+# Cleared the first time an O_TMPFILE can't be linked into place (some
+# sandboxes and filesystems refuse linkat via /proc), after which downloads
+# go straight to a .part file.
+_LINK_TMPFILES = hasattr(os, "O_TMPFILE")
+
+
+def _open_download(out_dir: str, tmp_path: str) -> Tuple[int, bool]:
+    """
+    Opens the file a download is written to. Where supported this is an
+    anonymous O_TMPFILE in out_dir, which never shows up in the directory
+    until it's linked into place, so a failed download leaves nothing behind.
+    Otherwise falls back to tmp_path. Returns (fd, anonymous).
+    """
+    if _LINK_TMPFILES:
+        try:
+            return os.open(out_dir, os.O_TMPFILE | os.O_RDWR, 0o644), True
+        except OSError:
+            pass  # filesystem doesn't support it
+    return os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644), False
+
+
+def _publish_download(fd: int, anonymous: bool, tmp_path: str, final_path: str):
+    global _LINK_TMPFILES
+    if anonymous:
+        try:
+            os.link(f"/proc/self/fd/{fd}", final_path, follow_symlinks=True)
+            return
+        except OSError as ex:
+            print(f"Can't link O_TMPFILE into place ({ex}), using .part files")
+            _LINK_TMPFILES = False
+        with open(tmp_path, "wb") as f:
+            os.lseek(fd, 0, os.SEEK_SET)
+            while os.sendfile(f.fileno(), fd, None, 1 << 30):
+                pass
+    os.replace(tmp_path, final_path)
+
+
 def download_zip(i: int, out_dir: str) -> str:
     prefix = f"{i:02x}"
     filename = f"{prefix}.zip"
@@ -47,89 +352,61 @@ def download_zip(i: int, out_dir: str) -> str:
     os.makedirs(out_dir, exist_ok=True)
     tmp_path = os.path.join(out_dir, filename + ".part")
 
-    print(f"Downloading {url} -> {tmp_path}")
-
-    # Make requests a bit more robust and keep connections reused
-    with requests.Session() as session:
-        with session.get(url, stream=True, timeout=(10, 60)) as r:
-            r.raise_for_status()
-
-            total = r.headers.get("Content-Length")
-            total_bytes = int(total) if total and total.isdigit() else None
-
-            downloaded = 0
-            start = time.monotonic()
-            last_print = start
-            last_bytes = 0
-
-            # tune these if you want
-            chunk_size = 1024 * 256  # 256KB
-            min_print_interval = 0.15  # seconds
-
-            with open(tmp_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=chunk_size):
-                    if not chunk:
-                        continue
-                    f.write(chunk)
-                    downloaded += len(chunk)
-
-                    now = time.monotonic()
-                    if now - last_print >= min_print_interval:
-                        elapsed = now - start
-                        inst_bps = (downloaded - last_bytes) / max(now - last_print, 1e-9)
-                        avg_bps = downloaded / max(elapsed, 1e-9)
-
-                        if total_bytes:
-                            pct = (downloaded / total_bytes) * 100.0
-                            remaining = total_bytes - downloaded
-                            eta = remaining / max(avg_bps, 1e-9)
-                            line = (
-                                f"\r{filename}  "
-                                f"{pct:6.2f}%  "
-                                f"{_fmt_bytes(downloaded)}/{_fmt_bytes(total_bytes)}  "
-                                f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}  "
-                                f"ETA {_fmt_eta(eta)}"
-                            )
-                        else:
-                            line = (
-                                f"\r{filename}  "
-                                f"{_fmt_bytes(downloaded)}  "
-                                f"inst {_fmt_rate(inst_bps)}  avg {_fmt_rate(avg_bps)}"
-                            )
-                        print(line, flush=True)
-                        last_print = now
-                        last_bytes = downloaded
-
-            # final print line + newline
-            end = time.monotonic()
-            elapsed = end - start
-            avg_bps = downloaded / max(elapsed, 1e-9)
-            if total_bytes:
-                sys.stdout.write(
-                    f"\r{filename}  100.00%  "
-                    f"{_fmt_bytes(downloaded)}/{_fmt_bytes(total_bytes)}  "
-                    f"avg {_fmt_rate(avg_bps)}  ETA 00:00\n"
-                )
-            else:
-                sys.stdout.write(f"\r{filename}  {_fmt_bytes(downloaded)}  avg {_fmt_rate(avg_bps)}\n")
-            sys.stdout.flush()
-
-    os.rename(tmp_path, final_path)
+    print(f"Downloading {url} -> {final_path}")
+
+    fd, anonymous = _open_download(out_dir, tmp_path)
+    try:
+        # A single connection to archive.org tops out well below link speed,
+        # so fetch byte ranges over several connections when we can.
+        url, total_bytes = _probe_ranges(_SESSION, url)
+        if total_bytes:
+            _download_ranged(_SESSION, url, fd, total_bytes, filename)
+        else:
+            _download_stream(_SESSION, url, fd, filename)
+        _publish_download(fd, anonymous, tmp_path, final_path)
+    finally:
+        os.close(fd)
     print(f"Downloaded {final_path}")
     return final_path
 
 
+_S3_CLIENTS = {}
+_S3_CLIENTS_LOCK = threading.Lock()
+
+
+def _s3_client(endpoint: str):
+    # Creating clients isn't thread-safe, and each one is worth reusing for
+    # its connection pool, so build one per endpoint on first use.
+    with _S3_CLIENTS_LOCK:
+        client = _S3_CLIENTS.get(endpoint)
+        if client is None:
+            client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=endpoint,
+                region_name=os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION"),
+                config=Config(max_pool_connections=UPLOAD_WORKERS * UPLOAD_THREADS),
+            )
+            _S3_CLIENTS[endpoint] = client
+        return client
+
+
 def upload_files(dir: str,
                  id: str,
                  bucket: str = "wadarchive2",
                  endpoint: str = "https://nyc3.digitaloceanspaces.com"):
     print(f"Uploading files from {dir} to s3://{bucket}/{id}...")
-    subprocess.run(
-        ["aws", "s3", "sync", dir, f"s3://{bucket}/",
-            "--endpoint", endpoint, "--acl", "public-read"],
-        check=True,
-    )
-    print(f"Synced files from {dir} to s3://{bucket}/{id}...")
+    s3 = _s3_client(endpoint)
+    paths = [os.path.join(root, f) for root, _, files in os.walk(dir) for f in files]
+
+    def upload(path: str):
+        key = os.path.relpath(path, dir).replace(os.sep, "/")
+        s3.upload_file(path, bucket, key, Config=S3_TRANSFER_CONFIG,
+                       ExtraArgs={"ACL": "public-read"})
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_THREADS) as ex:
+        for _ in ex.map(upload, paths):
+            pass
+    print(f"Uploaded {len(paths)} files from {dir} to s3://{bucket}/{id}...")
 
 
 def mark_done(done_path: str, zip_path: str):
@@ -137,7 +414,8 @@ def mark_done(done_path: str, zip_path: str):
     with open(done_path, 'w') as f:
         f.write('1')
     print(f"Marked done: {done_path}")
-    os.remove(zip_path)
+    if os.path.exists(zip_path):
+        os.remove(zip_path)
 
 
 def cleanup(zip_path: str, extract_dir: str):
@@ -155,57 +433,368 @@ def rename_dirs(tmp_dir: str, id: str):
     38-character names are renamed by adding the given prefix.
     Any other name length raises an error.
     """
-    entries = os.listdir(tmp_dir)
-    for entry in entries:
-        print(f"  Entry: '{entry}'")
-        entry = str(entry.strip())
-        if len(entry) != 38:
-            continue
-        new_entry = id + entry
-        old_path = os.path.join(tmp_dir, entry)
-        new_path = os.path.join(tmp_dir, new_entry)
-        print(f"Renaming {entry} to {new_entry}")
-        os.rename(old_path, new_path)
-        print(f"Moved {old_path} to {new_path}")
-
-def process_zip(i: int, out_dir: str):
+    renamed = 0
+    with os.scandir(tmp_dir) as it:
+        for entry in it:
+            name = entry.name.strip()
+            if len(name) != 38:
+                continue
+            os.rename(entry.path, os.path.join(tmp_dir, id + name))
+            renamed += 1
+    print(f"Renamed {renamed} entries in {tmp_dir} with prefix {id}")
+
+def _member_path(dest: str, name: str) -> str:
+    # Same sanitizing as zipfile: drop empty, "." and ".." components.
+    parts = [p for p in name.split("/") if p not in ("", ".", "..")]
+    return os.path.join(dest, *parts)
+
+
+def _make_member_dirs(names: List[str], dest: str):
+    # Create the directory tree up front so extract workers don't race on it.
+    dirs = {_member_path(dest, n) if n.endswith("/") else os.path.dirname(_member_path(dest, n))
+            for n in names}
+    for d in sorted(dirs):
+        os.makedirs(d, exist_ok=True)
+
+
+def _extract_members(zip_path: str, names: List[str], dest: str):
+    with zipfile.ZipFile(zip_path) as z:
+        for name in names:
+            z.extract(name, dest)
+
+
+def extract_zip(zip_path: str, dest: str, threads: int = UNZIP_THREADS):
+    """
+    Extracts zip_path into dest, inflating members on several threads.
+    zlib releases the GIL while inflating, and each thread opens its own
+    ZipFile so they don't contend on a shared file offset.
+    """
+    with zipfile.ZipFile(zip_path) as z:
+        names = z.namelist()
+    _make_member_dirs(names, dest)
+    files = [n for n in names if not n.endswith("/")]
+    if not files:
+        return
+    threads = max(1, min(threads, len(files)))
+    step = -(-len(files) // threads)
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        futures = [ex.submit(_extract_members, zip_path, files[k:k + step], dest)
+                   for k in range(0, len(files), step)]
+        for fut in futures:
+            fut.result()
+
+
+class _HttpRangeFile(io.RawIOBase):
+    """
+    Read-only, seekable view of a remote file over HTTP range requests.
+    Only used to let zipfile parse the central directory at the end of the
+    archive, which takes a handful of small reads.
+    """
+
+    def __init__(self, session: requests.Session, url: str, size: int):
+        self.session = session
+        self.url = url
+        self.size = size
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.pos = offset
+        elif whence == io.SEEK_CUR:
+            self.pos += offset
+        else:
+            self.pos = self.size + offset
+        return self.pos
+
+    def read(self, n: int = -1) -> bytes:
+        end = self.size if n is None or n < 0 else min(self.size, self.pos + n)
+        if end <= self.pos:
+            return b""
+        r = self.session.get(self.url, headers={"Range": f"bytes={self.pos}-{end - 1}"},
+                             timeout=(10, 60))
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise RuntimeError(f"Server ignored Range request for {self.url}")
+        self.pos += len(r.content)
+        return r.content
+
+
+def _read_exact(raw, n: int) -> bytes:
+    chunks = []
+    while n > 0:
+        b = raw.read(n)
+        if not b:
+            raise zipfile.BadZipFile("Unexpected end of ranged response")
+        chunks.append(b)
+        n -= len(b)
+    return b"".join(chunks)
+
+
+def _streamable(zi: zipfile.ZipInfo) -> bool:
+    encrypted = zi.flag_bits & 0x1
+    return not encrypted and zi.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+
+def _group_members(infos: List[zipfile.ZipInfo], data_end: int,
+                   n: int) -> List[Tuple[List[zipfile.ZipInfo], int]]:
+    """
+    Splits members (sorted by offset) into at most n contiguous groups of
+    roughly equal byte size. Returns (members, end offset) per group.
+    """
+    target = (data_end - infos[0].header_offset) / max(1, n)
+    groups = []
+    group: List[zipfile.ZipInfo] = []
+    for k, zi in enumerate(infos):
+        group.append(zi)
+        end = infos[k + 1].header_offset if k + 1 < len(infos) else data_end
+        if end - group[0].header_offset >= target or k + 1 == len(infos):
+            groups.append((group, end))
+            group = []
+    return groups
+
+
+def _extract_member_span(session: requests.Session, url: str,
+                         members: List[zipfile.ZipInfo], span_end: int,
+                         dest: str, progress: _Progress):
+    start = members[0].header_offset
+    headers = {"Range": f"bytes={start}-{span_end - 1}"}
+    with _CONNECTION_SLOTS, \
+            session.get(url, headers=headers, stream=True, timeout=(10, 60)) as r:
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise RuntimeError(f"Server ignored Range request for {url}")
+        pos = start
+
+        def read(n: int) -> bytes:
+            nonlocal pos
+            buf = _read_exact(r.raw, n)
+            pos += n
+            progress.add(n)
+            return buf
+
+        def skip(n: int):
+            while n > 0:
+                n -= len(read(min(n, STREAM_CHUNK_BYTES)))
+
+        for zi in members:
+            skip(zi.header_offset - pos)
+            fh = _LOCAL_HEADER.unpack(read(_LOCAL_HEADER.size))
+            if fh[0] != b"PK\x03\x04":
+                raise zipfile.BadZipFile(f"Bad local header for {zi.filename}")
+            skip(fh[10] + fh[11])  # file name + extra field
+            if zi.is_dir():
+                continue
+            inflater = (zlib.decompressobj(-15)
+                        if zi.compress_type == zipfile.ZIP_DEFLATED else None)
+            crc = 0
+            remaining = zi.compress_size
+            with open(_member_path(dest, zi.filename), "wb") as f:
+                while remaining > 0:
+                    buf = read(min(remaining, STREAM_CHUNK_BYTES))
+                    remaining -= len(buf)
+                    if inflater is not None:
+                        buf = inflater.decompress(buf)
+                    crc = zlib.crc32(buf, crc)
+                    f.write(buf)
+                if inflater is not None:
+                    tail = inflater.flush()
+                    crc = zlib.crc32(tail, crc)
+                    f.write(tail)
+            if crc != zi.CRC:
+                raise zipfile.BadZipFile(f"Bad CRC-32 for {zi.filename}")
+        skip(span_end - pos)
+
+
+def stream_extract_zip(i: int, extract_dir: str) -> bool:
+    """
+    Extracts a remote zip without downloading it first: the central directory
+    is read with range requests, then contiguous spans of members are fetched
+    on DOWNLOAD_CONNECTIONS connections and inflated straight into their
+    output files. Returns False if the server or archive doesn't allow this,
+    in which case nothing has been written.
+    """
     id = f"{i:02x}"
-    zip_filename = f"{id}.zip"
-    wad_unzip_dir = f"{out_dir}/wad_unzip"
-    if not os.path.exists(wad_unzip_dir):
-        os.makedirs(wad_unzip_dir)
-    extract_dir = f"{wad_unzip_dir}/{id}"
-    zip_path = os.path.join(out_dir, zip_filename)
+    filename = f"{id}.zip"
+    url = f"{BASE_URL}/{filename}"
+    url, total_bytes = _probe_ranges(_SESSION, url)
+    if not total_bytes:
+        return False
+    with zipfile.ZipFile(_HttpRangeFile(_SESSION, url, total_bytes)) as z:
+        infos = sorted(z.infolist(), key=lambda zi: zi.header_offset)
+        data_end = z.start_dir
+    if not infos or not all(_streamable(zi) for zi in infos):
+        return False
+
+    def extract(dest: str):
+        _make_member_dirs([zi.filename for zi in infos], dest)
+        groups = _group_members(infos, data_end, DOWNLOAD_CONNECTIONS)
+        with _Progress(filename, data_end - infos[0].header_offset) as progress:
+            with ThreadPoolExecutor(max_workers=len(groups)) as ex:
+                futures = [ex.submit(_extract_member_span, _SESSION, url,
+                                     members, end, dest, progress)
+                           for members, end in groups]
+                for fut in futures:
+                    fut.result()
+
+    print(f"Streaming {url} -> {extract_dir}")
+    _extract_to(extract_dir, id, extract)
+    return True
+
+
+def _extract_to(extract_dir: str, id: str, extract):
+    if os.path.exists(extract_dir):
+        shutil.rmtree(extract_dir)
+    os.makedirs(extract_dir)
+    # The sentinel marks a partial extraction so a restart redoes it.
+    sentinel = os.path.join(extract_dir, INCOMPLETE_SENTINEL)
+    open(sentinel, "w").close()
+    extract(extract_dir)
+    rename_dirs(os.path.join(extract_dir, id), id)
+    os.remove(sentinel)
+
+
+def _paths(i: int, out_dir: str):
+    id = f"{i:02x}"
+    extract_dir = f"{out_dir}/wad_unzip/{id}"
+    zip_path = os.path.join(out_dir, f"{id}.zip")
     done_path = os.path.join(out_dir, f"_done", id)
+    return id, extract_dir, zip_path, done_path
+
+
+def wait_for_free_space(out_dir: str, min_free_bytes: int = MIN_FREE_BYTES):
+    """
+    Blocks until the filesystem holding out_dir has at least min_free_bytes free.
+    Downloads are gated on this so concurrent zips don't fill the disk.
+    Raises if there is too little free space and no zip in progress that
+    will release any.
+    """
+    warned = False
+    while (free := shutil.disk_usage(out_dir).free) < min_free_bytes:
+        with _ACTIVE_LOCK:
+            busy = bool(_ACTIVE_IDS)
+        if not busy:
+            raise RuntimeError(
+                f"only {_fmt_bytes(free)} free in {out_dir} and no zips in progress to "
+                f"release more; {_fmt_bytes(min_free_bytes)} is required (set MIN_FREE_GB)")
+        if not warned:
+            print(f"Waiting for {_fmt_bytes(min_free_bytes)} free in {out_dir}...")
+            warned = True
+        time.sleep(5)
+
+
+def download_stage(i: int, out_dir: str):
+    id, extract_dir, zip_path, done_path = _paths(i, out_dir)
     if os.path.exists(done_path):
         print(f"Skipping {id}, already done.")
         cleanup(zip_path, extract_dir)
-        return
-    if os.path.exists(extract_dir):
-        upload_files(os.path.join(extract_dir, id), id=id)
-        return mark_done(done_path, zip_path)
-    tmp_dir = f"{extract_dir}_tmp"
-    if os.path.exists(tmp_dir):
-        shutil.rmtree(tmp_dir)
-    os.makedirs(tmp_dir)
+        return None
+    if os.path.exists(extract_dir) and not os.path.exists(
+            os.path.join(extract_dir, INCOMPLETE_SENTINEL)):
+        # Already unzipped by a previous run; go straight to upload.
+        with _ACTIVE_LOCK:
+            _ACTIVE_IDS.add(i)
+        return (i, out_dir, None)
+    os.makedirs(os.path.dirname(extract_dir), exist_ok=True)
+    wait_for_free_space(out_dir)
+    with _ACTIVE_LOCK:
+        _ACTIVE_IDS.add(i)
+    if STREAM_EXTRACT and stream_extract_zip(i, extract_dir):
+        return (i, out_dir, None)
     zip_path = download_zip(i, out_dir)
-    subprocess.run(
-        ["unzip", "-q", zip_path, "-d", tmp_dir],
-        check=True,
-    )
-    rename_dirs(os.path.join(tmp_dir, id), id)
-    os.rename(tmp_dir, extract_dir)
+    return (i, out_dir, zip_path)
+
+
+def unzip_stage(i: int, out_dir: str, zip_path: Optional[str]):
+    id, extract_dir, _, _ = _paths(i, out_dir)
+    if zip_path is None:
+        return (i, out_dir)
+    _extract_to(extract_dir, id, lambda dest: extract_zip(zip_path, dest))
     print(f"Unzipped {zip_path} to {extract_dir}")
+    return (i, out_dir)
+
+
+def upload_stage(i: int, out_dir: str):
+    id, extract_dir, zip_path, done_path = _paths(i, out_dir)
     upload_files(os.path.join(extract_dir, id), id=id)
     mark_done(done_path, zip_path)
     cleanup(zip_path, extract_dir)
+    with _ACTIVE_LOCK:
+        _ACTIVE_IDS.discard(i)
+
+
+def _start_stage(name: str, fn, in_q: queue.Queue, out_q: Optional[queue.Queue],
+                 workers: int, failed: List[int]) -> List[threading.Thread]:
+    def worker():
+        while True:
+            item = in_q.get()
+            if item is _STOP:
+                return
+            try:
+                result = fn(*item)
+            except Exception as ex:
+                print(f"{name} failed for {item[0]:02x}: {type(ex).__name__}: {ex}")
+                failed.append(item[0])
+                # Its files stay on disk, but nothing will clean them up now.
+                with _ACTIVE_LOCK:
+                    _ACTIVE_IDS.discard(item[0])
+                continue
+            if result is not None and out_q is not None:
+                out_q.put(result)
+
+    threads = [threading.Thread(target=worker, name=f"{name}-{n}", daemon=True)
+               for n in range(workers)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def _stop_stage(threads: List[threading.Thread], in_q: queue.Queue):
+    for _ in threads:
+        in_q.put(_STOP)
+    for t in threads:
+        t.join()
+
 
 def download_wad_archive(out_dir: str):
     start_range = int(os.getenv("START_RANGE", "0"))
     end_range = int(os.getenv("END_RANGE", "256"))
     print(f"Processing WAD archive from {start_range:02x} to {end_range:02x}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    # download -> unzip -> upload, each stage with its own workers so a slow
+    # upload doesn't stall downloads (and vice versa). The bounded queues
+    # apply backpressure so finished zips don't pile up on disk.
+    download_q: queue.Queue = queue.Queue()
+    unzip_q: queue.Queue = queue.Queue(maxsize=UNZIP_WORKERS)
+    upload_q: queue.Queue = queue.Queue(maxsize=UPLOAD_WORKERS)
+    failed: List[int] = []
+
     for i in range(start_range, end_range):
-        process_zip(i, out_dir)
+        download_q.put((i, out_dir))
+
+    downloaders = _start_stage("download", download_stage, download_q, unzip_q,
+                               DOWNLOAD_WORKERS, failed)
+    unzippers = _start_stage("unzip", unzip_stage, unzip_q, upload_q,
+                             UNZIP_WORKERS, failed)
+    uploaders = _start_stage("upload", upload_stage, upload_q, None,
+                             UPLOAD_WORKERS, failed)
+
+    _stop_stage(downloaders, download_q)
+    _stop_stage(unzippers, unzip_q)
+    _stop_stage(uploaders, upload_q)
+
+    if failed:
+        ids = ", ".join(f"{i:02x}" for i in sorted(failed))
+        raise RuntimeError(f"Failed to process {len(failed)} zips: {ids}")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,23 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import mmap
 import os
 import re
 import struct
-from typing import Dict, Any, List, Optional, Tuple
+import sys
+from typing import Dict, Any, List, Optional, Union
+
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+
+    _NUMBA_AVAILABLE = True
+except Exception:  # pragma: no cover
+    _NUMBA_AVAILABLE = False
+
+Buffer = Union[bytes, memoryview]
 
 MAP_RE = re.compile(r"^(MAP\d\d|E\dM\d)$")
 
@@ -40,6 +53,17 @@ MONSTER_THING_IDS = {
     3003: "baron",
 }
 
+# Lookup tables indexed by thing type (as uint16) so a whole THINGS lump can be
+# classified with one fancy-indexing op.
+MONSTER_NAMES = list(MONSTER_THING_IDS.values())
+MONSTER_SLOT = np.full(65536, -1, dtype=np.int16)
+for _slot, _tid in enumerate(MONSTER_THING_IDS):
+    MONSTER_SLOT[_tid] = _slot
+KEY_NAMES = list(KEY_THING_IDS.values())
+KEY_SLOT = np.full(65536, -1, dtype=np.int16)
+for _slot, _tid in enumerate(KEY_THING_IDS):
+    KEY_SLOT[_tid] = _slot
+
 # Linedef specials for exits/teleports
 # Secret exit types (51/124/198) :contentReference[oaicite:4]{index=4}
 SECRET_EXIT_SPECIALS = {51, 124, 198}
@@ -47,6 +71,12 @@ SECRET_EXIT_SPECIALS = {51, 124, 198}
 # Teleport examples commonly used in Doom/Boom maps (39, 97, 125, 126, etc.) :contentReference[oaicite:5]{index=5}
 TELEPORT_SPECIALS = {39, 97, 125, 126, 174, 195}
 
+# Same idea as the thing LUTs, indexed by linedef special (as uint16).
+SECRET_EXIT_LUT = np.zeros(65536, dtype=bool)
+SECRET_EXIT_LUT[list(SECRET_EXIT_SPECIALS)] = True
+TELEPORT_LUT = np.zeros(65536, dtype=bool)
+TELEPORT_LUT[list(TELEPORT_SPECIALS)] = True
+
 # Record sizes (Doom format)
 DOOM_THINGS_REC = 10
 DOOM_LINEDEFS_REC = 14
@@ -61,6 +91,20 @@ DOOM_NODES_REC = 28
 HEXEN_THINGS_REC = 20
 HEXEN_LINEDEFS_REC = 16
 
+WAD_DIRECTORY_DTYPE = np.dtype([
+    ("offset", "<u4"),
+    ("size", "<u4"),
+    ("name", "S8"),
+])
+
+THINGS_DTYPE = np.dtype([
+    ("x", "<i2"),
+    ("y", "<i2"),
+    ("angle", "<i2"),
+    ("type", "<i2"),
+    ("flags", "<i2"),
+])
+
 
 def read_u32le(b: bytes, off: int) -> int:
     return struct.unpack_from("<I", b, off)[0]
@@ -93,14 +137,20 @@ def parse_wad_directory(path: str) -> Dict[str, Any]:
         f.seek(dir_offset)
         directory = f.read(dir_size)
 
-    lumps = []
-    for i in range(lump_count):
-        base = i * 16
-        lump_off = read_u32le(directory, base + 0)
-        lump_size = read_u32le(directory, base + 4)
-        raw_name = directory[base + 8 : base + 16]
-        name = raw_name.split(b"\x00", 1)[0].decode("ascii", errors="replace")
-        lumps.append({"index": i, "name": name, "offset": lump_off, "size": lump_size})
+    dirarr = np.frombuffer(directory, dtype=WAD_DIRECTORY_DTYPE, count=lump_count)
+
+    # Names end at the first NUL; blank everything after it so the S8 view
+    # (which only drops trailing NULs) matches split(b"\x00", 1)[0].
+    raw_names = np.frombuffer(directory, dtype=np.uint8, count=lump_count * 16).reshape(-1, 16)[:, 8:]
+    raw_names = np.where(np.cumsum(raw_names == 0, axis=1) > 0, 0, raw_names).astype(np.uint8)
+    names = np.char.decode(raw_names.view("S8").ravel(), "ascii", errors="replace")
+
+    lumps = [
+        {"index": i, "name": name, "offset": lump_off, "size": lump_size}
+        for i, (name, lump_off, lump_size) in enumerate(
+            zip(names.tolist(), dirarr["offset"].tolist(), dirarr["size"].tolist())
+        )
+    ]
 
     return {
         "type": ident,
@@ -109,35 +159,47 @@ def parse_wad_directory(path: str) -> Dict[str, Any]:
     }
 
 
+def is_map_marker(name: str) -> bool:
+    # Cheap length/prefix test first; only candidates go through the regex.
+    n = len(name)
+    if n == 5:
+        candidate = name.startswith("MAP")
+    elif n == 4:
+        candidate = name[0] == "E" and name[2] == "M"
+    else:
+        return False
+    return candidate and MAP_RE.match(name) is not None
+
+
 def build_map_blocks(lumps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     names = [l["name"] for l in lumps]
-    markers = [i for i, n in enumerate(names) if MAP_RE.match(n)]
+    markers = [i for i, n in enumerate(names) if is_map_marker(n)]
 
     blocks = []
     for idx, start in enumerate(markers):
         end = markers[idx + 1] if idx + 1 < len(markers) else len(lumps)
         block_lumps = lumps[start:end]
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for l in block_lumps:
+            by_name.setdefault(l["name"], l)
         blocks.append({
             "map": names[start],
             "start_index": start,
             "end_index_exclusive": end,
             "lumps": block_lumps,
+            "by_name": by_name,
         })
     return blocks
 
 
 def find_lump(block: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
-    # Within a map block, lump names are unique in normal maps; pick first match
-    for l in block["lumps"]:
-        if l["name"] == name:
-            return l
-    return None
+    # Within a map block, lump names are unique in normal maps; by_name keeps the first match
+    return block["by_name"].get(name)
 
 
-def read_lump_bytes(wad_path: str, lump: Dict[str, Any]) -> bytes:
-    with open(wad_path, "rb") as f:
-        f.seek(lump["offset"])
-        return f.read(lump["size"])
+def get_lump(wad: memoryview, lump: Dict[str, Any]) -> memoryview:
+    # Zero-copy slice of the mmapped WAD; np.frombuffer reads it in place.
+    return wad[lump["offset"] : lump["offset"] + lump["size"]]
 
 
 def safe_count(size: int, rec: int) -> int:
@@ -170,36 +232,174 @@ def detect_map_format(block: Dict[str, Any]) -> str:
     return "unknown"
 
 
-def parse_doom_things(things_bytes: bytes) -> List[Tuple[int, int]]:
+def parse_doom_things(things_bytes: Buffer) -> np.ndarray:
     """
-    Returns list of (thing_type, flags) for Doom-format THINGS.
+    Returns a THINGS_DTYPE structured array for Doom-format THINGS.
     THINGS record is 5 * int16: x, y, angle, type, flags
     Flags bits: 0 skill1-2, 1 skill3, 2 skill4-5, 3 ambush, 4 multiplayer-only :contentReference[oaicite:6]{index=6}
     """
-    out = []
     if len(things_bytes) % DOOM_THINGS_REC != 0:
-        return out
-
-    for (x, y, angle, ttype, flags) in struct.iter_unpack("<hhhhh", things_bytes):
-        out.append((ttype, flags))
-    return out
+        return np.empty(0, dtype=THINGS_DTYPE)
+    return np.frombuffer(things_bytes, dtype=THINGS_DTYPE)
 
 
-def parse_doom_linedefs_specials(linedefs_bytes: bytes) -> List[int]:
+def parse_linedefs_specials(linedefs_bytes: Buffer, rec_size: int) -> np.ndarray:
     """
+    Returns the int16 "special" column (4th int16) of each linedef record.
     Doom linedef record: v1, v2, flags, special, tag, right, left (7 * int16)
     """
+    if not linedefs_bytes or len(linedefs_bytes) % rec_size != 0:
+        return np.empty(0, dtype="<i2")
+    # Strided view over just the special field (bytes 6..8 of each record);
+    # nothing else in the lump is touched.
+    return np.ndarray(
+        shape=(len(linedefs_bytes) // rec_size,),
+        dtype="<i2",
+        buffer=linedefs_bytes,
+        offset=6,
+        strides=(rec_size,),
+    )
+
+
+def parse_doom_linedefs_specials(linedefs_bytes: Buffer) -> np.ndarray:
+    return parse_linedefs_specials(linedefs_bytes, DOOM_LINEDEFS_REC)
+
+
+def _classify_things_numpy(types: np.ndarray, flags: np.ndarray, thing_map: np.ndarray, n_maps: int):
+    key_slots = KEY_SLOT[types]
+    is_key = key_slots >= 0
+    keys_present = np.bincount(
+        thing_map[is_key] * len(KEY_NAMES) + key_slots[is_key],
+        minlength=n_maps * len(KEY_NAMES),
+    ).reshape(n_maps, len(KEY_NAMES)) > 0
+
+    slots = MONSTER_SLOT[types]
+    is_monster = slots >= 0
+    monster_map = thing_map[is_monster]
+    by_type_counts = np.bincount(
+        monster_map * len(MONSTER_NAMES) + slots[is_monster],
+        minlength=n_maps * len(MONSTER_NAMES),
+    ).reshape(n_maps, len(MONSTER_NAMES))
+
+    # skill flags bits per spec :contentReference[oaicite:7]{index=7}
+    monster_flags = flags[is_monster]
+    uv = np.bincount(monster_map[(monster_flags & (1 << 2)) != 0], minlength=n_maps)   # skill 4-5 (UV/NM)
+    hmp = np.bincount(monster_map[(monster_flags & (1 << 1)) != 0], minlength=n_maps)  # skill 3 (HMP)
+    htr = np.bincount(monster_map[(monster_flags & (1 << 0)) != 0], minlength=n_maps)  # skill 1-2 (ITYTD/HNTR)
+    return by_type_counts, keys_present, uv, hmp, htr
+
+
+def _classify_things_loop(types, flags, thing_map, n_maps, monster_slot, key_slot, n_monsters, n_keys):
+    # Single pass over every thing; compiled with numba when it's installed.
+    by_type_counts = np.zeros((n_maps, n_monsters), dtype=np.int64)
+    keys_present = np.zeros((n_maps, n_keys), dtype=np.bool_)
+    uv = np.zeros(n_maps, dtype=np.int64)
+    hmp = np.zeros(n_maps, dtype=np.int64)
+    htr = np.zeros(n_maps, dtype=np.int64)
+    for i in range(types.shape[0]):
+        m = thing_map[i]
+        k = key_slot[types[i]]
+        if k >= 0:
+            keys_present[m, k] = True
+        slot = monster_slot[types[i]]
+        if slot < 0:
+            continue
+        by_type_counts[m, slot] += 1
+        f = flags[i]
+        if f & 4:
+            uv[m] += 1
+        if f & 2:
+            hmp[m] += 1
+        if f & 1:
+            htr[m] += 1
+    return by_type_counts, keys_present, uv, hmp, htr
+
+
+if _NUMBA_AVAILABLE:
+    _classify_things_jit = njit(cache=True, nogil=True)(_classify_things_loop)
+
+
+def classify_things(types: np.ndarray, flags: np.ndarray, thing_map: np.ndarray, n_maps: int):
+    """
+    Returns per-map (monster counts by slot, key presence by slot, uv, hmp, htr)
+    for the concatenated things of n_maps maps.
+    """
+    if _NUMBA_AVAILABLE:
+        return _classify_things_jit(types, flags, thing_map, n_maps, MONSTER_SLOT, KEY_SLOT,
+                                    len(MONSTER_NAMES), len(KEY_NAMES))
+    return _classify_things_numpy(types, flags, thing_map, n_maps)
+
+
+def analyze_maps(wad: memoryview, blocks: List[Dict[str, Any]], fmts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Parses THINGS and LINEDEFS for every map, then classifies them all at once:
+    records from every map are concatenated with a parallel map index, so the
+    LUT lookups and counting run once per WAD instead of once per map.
+    Returns per-map "mechanics", "monsters" and "difficulty" sections.
+    """
+    n_maps = len(blocks)
+    if n_maps == 0:
+        return []
+    things_per_map: List[np.ndarray] = []
+    specials_per_map: List[np.ndarray] = []
+    for block, fmt in zip(blocks, fmts):
+        linedefs_lump = find_lump(block, "LINEDEFS")
+        if linedefs_lump:
+            linedefs_bytes = get_lump(wad, linedefs_lump)
+            if fmt == "doom":
+                specials = parse_doom_linedefs_specials(linedefs_bytes)
+            else:
+                # For hexen format, "specials" are still present but record layout differs.
+                # We'll do a lightweight heuristic: take the "special" as the 4th int16 in a 16-byte record (after v1,v2,flags).
+                specials = parse_linedefs_specials(linedefs_bytes, HEXEN_LINEDEFS_REC)
+        else:
+            specials = np.empty(0, dtype="<i2")
+        specials_per_map.append(specials)
+
+        # Key thing IDs may differ in non-vanilla sets, so for non-Doom formats we
+        # leave keys empty and monster details empty to avoid lying.
+        things_lump = find_lump(block, "THINGS")
+        if things_lump and fmt == "doom":
+            things_per_map.append(parse_doom_things(get_lump(wad, things_lump)))
+        else:
+            things_per_map.append(np.empty(0, dtype=THINGS_DTYPE))
+
+    # Mechanics from linedef specials
+    # concatenate gathers only the strided special columns; reinterpret in place.
+    specials = np.concatenate(specials_per_map).view(np.uint16)
+    special_map = np.repeat(np.arange(n_maps), [len(sp) for sp in specials_per_map])
+    teleports = np.bincount(special_map[TELEPORT_LUT[specials]], minlength=n_maps) > 0
+    secret_exits = np.bincount(special_map[SECRET_EXIT_LUT[specials]], minlength=n_maps) > 0
+
+    # Keys + monster totals + difficulty buckets from things
+    things = np.concatenate(things_per_map)
+    thing_map = np.repeat(np.arange(n_maps), [len(t) for t in things_per_map])
+    by_type_counts, keys_present, uv, hmp, htr = classify_things(
+        things["type"].astype(np.uint16), things["flags"], thing_map, n_maps)
+
     out = []
-    if len(linedefs_bytes) % DOOM_LINEDEFS_REC != 0:
-        return out
-    for (v1, v2, flags, special, tag, right, left) in struct.iter_unpack("<hhhhhhh", linedefs_bytes):
-        out.append(int(special))
+    for i in range(n_maps):
+        by_type = {MONSTER_NAMES[j]: int(c) for j, c in enumerate(by_type_counts[i]) if c}
+        out.append({
+            "mechanics": {
+                "teleports": bool(teleports[i]),
+                "keys": sorted(KEY_NAMES[j] for j in np.flatnonzero(keys_present[i])),
+                "secret_exit": bool(secret_exits[i]),
+            },
+            "monsters": {
+                "total": int(by_type_counts[i].sum()),
+                "by_type": dict(sorted(by_type.items(), key=lambda kv: (-kv[1], kv[0]))),
+            },
+            "difficulty": {
+                "uv_monsters": int(uv[i]),   # skill 4-5 bucket
+                "hmp_monsters": int(hmp[i]),  # skill 3 bucket
+                "htr_monsters": int(htr[i]),  # skill 1-2 bucket
+            },
+        })
     return out
 
 
-def map_summary(wad_path: str, wad_meta: Dict[str, Any], block: Dict[str, Any]) -> Dict[str, Any]:
-    fmt = detect_map_format(block)
-
+def map_summary(block: Dict[str, Any], fmt: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
     # Core lump sizes → counts
     def lump_count(name: str, rec_size: int) -> int:
         l = find_lump(block, name)
@@ -216,104 +416,19 @@ def map_summary(wad_path: str, wad_meta: Dict[str, Any], block: Dict[str, Any])
         "nodes": lump_count("NODES", DOOM_NODES_REC),
     }
 
-    mechanics = {
-        "teleports": False,
-        "keys": [],
-        "secret_exit": False,
-    }
-
-    monsters = {
-        "total": 0,
-        "by_type": {},
-    }
-
-    difficulty = {
-        "uv_monsters": 0,   # skill 4-5 bucket
-        "hmp_monsters": 0,  # skill 3 bucket
-        "htr_monsters": 0,  # skill 1-2 bucket
-    }
-
     compatibility = "unknown"
     if fmt == "doom":
         compatibility = "vanilla_or_boom"
     elif fmt == "hexen":
         compatibility = "hexen"
 
-    # Parse mechanics + monsters where we can
-    linedefs_lump = find_lump(block, "LINEDEFS")
-    if linedefs_lump:
-        linedefs_bytes = read_lump_bytes(wad_path, linedefs_lump)
-
-        specials: List[int] = []
-        if fmt == "doom":
-            specials = parse_doom_linedefs_specials(linedefs_bytes)
-        else:
-            # For hexen format, "specials" are still present but record layout differs.
-            # We'll do a lightweight heuristic: take the "special" as the 3rd int16 in a 16-byte record (after v1,v2,flags).
-            if len(linedefs_bytes) % HEXEN_LINEDEFS_REC == 0:
-                for rec in struct.iter_unpack("<hhhhhhhh", linedefs_bytes):
-                    # v1,v2,flags,special, arg1..arg5
-                    specials.append(int(rec[3]))
-
-        if any(s in TELEPORT_SPECIALS for s in specials):
-            mechanics["teleports"] = True
-        if any(s in SECRET_EXIT_SPECIALS for s in specials):
-            mechanics["secret_exit"] = True
-
-    things_lump = find_lump(block, "THINGS")
-    if things_lump and fmt == "doom":
-        things_bytes = read_lump_bytes(wad_path, things_lump)
-        things = parse_doom_things(things_bytes)
-
-        key_set = set()
-
-        # Monster totals + difficulty buckets
-        total_monsters = 0
-        by_type: Dict[str, int] = {}
-
-        uv = 0
-        hmp = 0
-        htr = 0
-
-        for ttype, flags in things:
-            # keys
-            if ttype in KEY_THING_IDS:
-                key_set.add(KEY_THING_IDS[ttype])
-
-            # monsters
-            mname = MONSTER_THING_IDS.get(ttype)
-            if mname:
-                total_monsters += 1
-                by_type[mname] = by_type.get(mname, 0) + 1
-
-                # skill flags bits per spec :contentReference[oaicite:7]{index=7}
-                if flags & (1 << 2):  # skill 4-5 (UV/NM)
-                    uv += 1
-                if flags & (1 << 1):  # skill 3 (HMP)
-                    hmp += 1
-                if flags & (1 << 0):  # skill 1-2 (ITYTD/HNTR)
-                    htr += 1
-
-        mechanics["keys"] = sorted(list(key_set))
-
-        monsters["total"] = total_monsters
-        monsters["by_type"] = dict(sorted(by_type.items(), key=lambda kv: (-kv[1], kv[0])))
-
-        difficulty["uv_monsters"] = uv
-        difficulty["hmp_monsters"] = hmp
-        difficulty["htr_monsters"] = htr
-    elif things_lump and fmt != "doom":
-        # Still extract keys for hexen if you want; key thing IDs may differ in non-vanilla sets,
-        # so we leave keys empty and monster details empty to avoid lying.
-        pass
-
     return {
         "map": block["map"],
         "format": fmt,
         "stats": stats,
-        "monsters": monsters,
-        "mechanics": mechanics,
-        "difficulty": difficulty,
+        "monsters": analysis["monsters"],
+        "mechanics": analysis["mechanics"],
+        "difficulty": analysis["difficulty"],
         "compatibility": compatibility,
         "metadata": {
             "title": None,     # WADs often don’t store display titles unless MAPINFO/UMAPINFO exists
@@ -326,7 +441,15 @@ def run(wad_path: str, out_path: Optional[str] = None):
     wad_meta = parse_wad_directory(wad_path)
     blocks = build_map_blocks(wad_meta["lumps"])
 
-    maps = [map_summary(wad_path, wad_meta, b) for b in blocks]
+    with open(wad_path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        fmts = [detect_map_format(b) for b in blocks]
+        with memoryview(mm) as wad:
+            analyses = analyze_maps(wad, blocks, fmts)
+        maps = [map_summary(b, fmt, a) for b, fmt, a in zip(blocks, fmts, analyses)]
+    finally:
+        mm.close()
 
     out_obj = {
         "file": os.path.abspath(wad_path),
@@ -335,13 +458,13 @@ def run(wad_path: str, out_path: Optional[str] = None):
         "maps": maps,
     }
 
-    data = json.dumps(out_obj, indent=2)
-
+    # Stream the encoder output instead of building the whole document first.
     if out_path:
         with open(out_path, "w", encoding="utf-8") as f:
-            f.write(data)
+            json.dump(out_obj, f, indent=2)
     else:
-        print(data)
+        json.dump(out_obj, sys.stdout, indent=2)
+        sys.stdout.write("\n")
 
 def _main():
     ap = argparse.ArgumentParser(description="Extract per-map JSON summaries from a WAD")
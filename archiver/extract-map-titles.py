@@ -14,12 +14,15 @@ By default it prints a Python list literal (so you can paste it into code).
 from __future__ import annotations
 
 import argparse
+import bisect
 import json
-import os
+import mmap
 import re
 import struct
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+Buffer = Union[bytes, memoryview, mmap.mmap]
 
 
 # -----------------------------
@@ -27,7 +30,7 @@ from typing import Dict, Iterable, List, Optional, Tuple
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WadLump:
     index: int
     name: str
@@ -38,74 +41,95 @@ class WadLump:
 WAD_HEADER_RE = re.compile(rb"^(IWAD|PWAD)$")
 
 
-def _read_u32le(b: bytes, off: int) -> int:
-    return struct.unpack_from("<I", b, off)[0]
+_WAD_DIR_ENTRY = struct.Struct("<II8s")
 
 
-def parse_wad_directory(path: str) -> Tuple[str, int, List[WadLump]]:
-    with open(path, "rb") as f:
-        header = f.read(12)
-        if len(header) != 12:
-            raise ValueError("File too small to be a WAD")
-
-        ident = header[0:4]
-        if not WAD_HEADER_RE.match(ident):
-            raise ValueError(f"Not a WAD (signature={ident!r})")
-        wad_type = ident.decode("ascii", errors="replace")
-        lump_count = int.from_bytes(header[4:8], "little", signed=False)
-        dir_offset = int.from_bytes(header[8:12], "little", signed=False)
-
-        if lump_count > 200_000:
-            raise ValueError("Unreasonable lump count")
-
-        f.seek(0, os.SEEK_END)
-        file_size = f.tell()
-        dir_size = lump_count * 16
-        if dir_offset + dir_size > file_size:
-            raise ValueError("Directory extends past EOF")
-
-        f.seek(dir_offset)
-        directory = f.read(dir_size)
-        if len(directory) != dir_size:
-            raise ValueError("Failed to read WAD directory")
+def parse_wad_directory(wad: Buffer) -> Tuple[str, int, List[WadLump]]:
+    """Parse the header and directory of an in-memory (or mmapped) WAD."""
+    if len(wad) < 12:
+        raise ValueError("File too small to be a WAD")
+
+    ident = bytes(wad[0:4])
+    if not WAD_HEADER_RE.match(ident):
+        raise ValueError(f"Not a WAD (signature={ident!r})")
+    wad_type = ident.decode("ascii", errors="replace")
+    lump_count, dir_offset = struct.unpack_from("<II", wad, 4)
+
+    if lump_count > 200_000:
+        raise ValueError("Unreasonable lump count")
+
+    file_size = len(wad)
+    dir_size = lump_count * 16
+    if dir_offset + dir_size > file_size:
+        raise ValueError("Directory extends past EOF")
+    directory = wad[dir_offset : dir_offset + dir_size]
 
     lumps: List[WadLump] = []
-    for i in range(lump_count):
-        base = i * 16
-        lump_off = _read_u32le(directory, base + 0)
-        lump_size = _read_u32le(directory, base + 4)
-        raw_name = directory[base + 8 : base + 16]
-        name = raw_name.split(b"\x00", 1)[0].decode("ascii", errors="replace")
+    for i, (lump_off, lump_size, raw_name) in enumerate(_WAD_DIR_ENTRY.iter_unpack(directory)):
+        # Stored upper-cased; every lookup by name is case-insensitive.
+        name = raw_name.split(b"\x00", 1)[0].decode("ascii", errors="replace").upper()
         lumps.append(WadLump(index=i, name=name, offset=lump_off, size=lump_size))
 
     return wad_type, file_size, lumps
 
 
+def parse_wad(path: str) -> Tuple[str, mmap.mmap, List[WadLump]]:
+    """Map the WAD once and parse its directory.
+
+    Lump data is then sliced straight out of the returned mmap; the caller
+    closes it.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError("File too small to be a WAD") from None
+    try:
+        with memoryview(mm) as wad:
+            wad_type, _file_size, lumps = parse_wad_directory(wad)
+    except Exception:
+        mm.close()
+        raise
+    return wad_type, mm, lumps
+
+
 MAP_MARKER_RE = re.compile(r"^(E[1-9]M[1-9]|MAP[0-9]{2})$", re.IGNORECASE)
 
 
+_CORE_MAP_LUMPS = ("THINGS", "LINEDEFS", "SIDEDEFS", "VERTEXES", "SECTORS")
+
+
+def _has_position_in(positions: List[int], start: int, stop: int) -> bool:
+    j = bisect.bisect_left(positions, start)
+    return j < len(positions) and positions[j] < stop
+
+
 def detect_maps_from_lumps(lumps: List[WadLump]) -> List[str]:
     """Return map markers in on-disk order.
 
     Uses a conservative heuristic: marker must be followed soon by core lumps.
     """
-    core = {"THINGS", "LINEDEFS", "SIDEDEFS", "VERTEXES", "SECTORS"}
-    names = [l.name.upper() for l in lumps]
-
-    found: List[str] = []
-    for i, n in enumerate(names):
-        if MAP_MARKER_RE.match(n):
-            window = set(names[i + 1 : i + 1 + 16])
-            if core.issubset(window):
-                found.append(n)
-    # preserve order, dedupe
-    seen = set()
-    out: List[str] = []
-    for m in found:
-        if m not in seen:
-            seen.add(m)
-            out.append(m)
-    return out
+    # One pass: note candidate markers and the sorted positions of each core
+    # lump. A marker qualifies if every core lump has a position within the
+    # 16 lumps after it.
+    core_positions: Dict[str, List[int]] = {c: [] for c in _CORE_MAP_LUMPS}
+    markers: List[Tuple[int, str]] = []
+    for i, l in enumerate(lumps):
+        positions = core_positions.get(l.name)
+        if positions is not None:
+            positions.append(i)
+        elif MAP_MARKER_RE.match(l.name):
+            markers.append((i, l.name))
+
+    # dict keys preserve order and dedupe in one go
+    found: Dict[str, None] = {}
+    for i, n in markers:
+        if n in found:
+            continue
+        if all(_has_position_in(positions, i + 1, i + 1 + 16)
+               for positions in core_positions.values()):
+            found[n] = None
+    return list(found)
 
 
 # -----------------------------
@@ -113,7 +137,7 @@ def detect_maps_from_lumps(lumps: List[WadLump]) -> List[str]:
 # -----------------------------
 
 
-TEXT_LUMP_NAMES = {
+TEXT_LUMP_NAMES = frozenset({
     "MAPINFO",
     "ZMAPINFO",
     "EMAPINFO",
@@ -122,7 +146,7 @@ TEXT_LUMP_NAMES = {
     "LANGUAGE",
     "BEX",
     "DEHACKED",
-}
+})
 
 
 def _safe_text_decode(b: bytes) -> str:
@@ -132,41 +156,77 @@ def _safe_text_decode(b: bytes) -> str:
         return b.decode("latin-1", errors="replace")
 
 
+_TRAILING_WS_RE = re.compile(r"[ \t]+\n")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
 def _normalize_whitespace(s: str) -> str:
     s = s.replace("\r\n", "\n").replace("\r", "\n")
-    s = re.sub(r"[ \t]+\n", "\n", s)
-    s = re.sub(r"\n{3,}", "\n\n", s)
+    s = _TRAILING_WS_RE.sub("\n", s)
+    s = _BLANK_LINES_RE.sub("\n\n", s)
     return s.strip()
 
 
 def _strip_mapinfo_comments(text: str) -> str:
-    # Remove /* ... */ blocks first, then // line comments.
-    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
-    text = re.sub(r"//.*?$", "", text, flags=re.MULTILINE)
+    # Remove /* ... */ blocks first, then // line comments. Both passes hop
+    # between delimiters with str.find instead of running a lazy regex.
+    parts: List[str] = []
+    pos = 0
+    while True:
+        start = text.find("/*", pos)
+        if start < 0:
+            break
+        end = text.find("*/", start + 2)
+        if end < 0:
+            break  # unterminated block comment is left as-is
+        parts.append(text[pos:start])
+        pos = end + 2
+    if pos:
+        parts.append(text[pos:])
+        text = "".join(parts)
+
+    parts = []
+    pos = 0
+    while True:
+        start = text.find("//", pos)
+        if start < 0:
+            break
+        parts.append(text[pos:start])
+        end = text.find("\n", start + 2)
+        if end < 0:
+            pos = len(text)
+            break
+        pos = end
+    if parts:
+        parts.append(text[pos:])
+        text = "".join(parts)
     return text
 
 
-def extract_text_lumps(path: str, lumps: List[WadLump], max_each: int = 256_000) -> Dict[str, str]:
+def extract_text_lumps(wad: Buffer, lumps: List[WadLump], max_each: int = 256_000) -> Dict[str, str]:
+    # Later lumps override earlier ones with the same name, so walk the
+    # directory backwards, keep the first usable hit per name, and stop once
+    # every text lump has been found.
     out: Dict[str, str] = {}
-    with open(path, "rb") as f:
-        for l in lumps:
-            name = l.name.upper()
-            if name not in TEXT_LUMP_NAMES:
-                continue
-            if l.size <= 0 or l.size > max_each:
-                continue
-            f.seek(l.offset)
-            chunk = f.read(l.size)
-            if not chunk:
-                continue
-
-            # Skip obviously-binary blobs (DEHACKED/BEX can contain some nulls).
-            if b"\x00" in chunk[:256] and name not in {"DEHACKED", "BEX"}:
-                continue
-
-            text = _normalize_whitespace(_safe_text_decode(chunk))
-            if text:
-                out[name] = text
+    for l in reversed(lumps):
+        name = l.name
+        if name not in TEXT_LUMP_NAMES or name in out:
+            continue
+        if l.size <= 0 or l.size > max_each:
+            continue
+        chunk = bytes(wad[l.offset : l.offset + l.size])
+        if not chunk:
+            continue
+
+        # Skip obviously-binary blobs (DEHACKED/BEX can contain some nulls).
+        if b"\x00" in chunk[:256] and name not in {"DEHACKED", "BEX"}:
+            continue
+
+        text = _normalize_whitespace(_safe_text_decode(chunk))
+        if text:
+            out[name] = text
+            if len(out) == len(TEXT_LUMP_NAMES):
+                break
     return out
 
 
@@ -242,25 +302,42 @@ _MAP_DECL_RE = re.compile(
 )
 
 
-def _find_matching_brace(text: str, open_brace_pos: int) -> Optional[int]:
-    depth = 0
-    for i in range(open_brace_pos, len(text)):
-        c = text[i]
-        if c == "{":
-            depth += 1
-        elif c == "}":
-            depth -= 1
-            if depth == 0:
-                return i
-    return None
+# levelname/title/name assignments and lookups in one pass over a block.
+# Group 1 is the assigned key (levelname/title/name), group 2 is "lookup"
+# (which may omit the '='), and group 3 is the quoted value.
+_BLOCK_KEY_RE = re.compile(r'(?is)\b(?:(levelname|title|name)\s*=|(lookup)\s*(?:=\s*)?)\s*\"([^\"]+)\"')
+_BLOCK_KEY_RANK = {"levelname": 0, "title": 1, "name": 2, "lookup": 3}
+
+
+_BRACE_RE = re.compile(r"[{}]")
+
 
+def _match_braces(text: str) -> Tuple[List[int], Dict[int, int]]:
+    """Pair up every brace in one pass over the text.
 
-def _extract_map_block(text: str, decl_end: int) -> Optional[Tuple[int, int, str]]:
+    Returns the positions of all '{' (ascending) and a map from each '{' to
+    its matching '}'; unbalanced '{' have no entry and stray '}' are ignored.
+    """
+    opens: List[int] = []
+    pairs: Dict[int, int] = {}
+    stack: List[int] = []
+    for m in _BRACE_RE.finditer(text):
+        pos = m.start()
+        if text[pos] == "{":
+            opens.append(pos)
+            stack.append(pos)
+        elif stack:
+            pairs[stack.pop()] = pos
+    return opens, pairs
+
+
+def _extract_map_block(text: str, decl_end: int, opens: List[int], pairs: Dict[int, int]) -> Optional[Tuple[int, int, str]]:
     # Find first '{' after the declaration.
-    open_pos = text.find("{", decl_end)
-    if open_pos < 0:
+    j = bisect.bisect_left(opens, decl_end)
+    if j == len(opens):
         return None
-    close_pos = _find_matching_brace(text, open_pos)
+    open_pos = opens[j]
+    close_pos = pairs.get(open_pos)
     if close_pos is None:
         return None
     return (open_pos, close_pos, text[open_pos + 1 : close_pos])
@@ -270,17 +347,19 @@ def _pick_title_for_block(*, header_title: Optional[str], header_lookup: Optiona
     if header_title and header_title.strip():
         return header_title.strip()
 
-    # Prefer levelname/title/name assignments.
-    for key in ("levelname", "title", "name"):
-        m = re.search(rf'(?is)\b{re.escape(key)}\s*=\s*\"([^\"]+)\"', block_text)
-        if m:
-            return m.group(1).strip()
-
-    # ZDoom-style lookup inside a block.
-    m = re.search(r'(?is)\blookup\s*(?:=\s*)?\"([^\"]+)\"', block_text)
-    if m:
-        k = m.group(1).strip()
-        v = strings.get(k)
+    # Prefer levelname/title/name assignments, in that order, then a
+    # ZDoom-style lookup inside the block; the first of each kind counts.
+    best: Optional[Tuple[int, str]] = None
+    for m in _BLOCK_KEY_RE.finditer(block_text):
+        rank = _BLOCK_KEY_RANK[(m.group(1) or m.group(2)).lower()]
+        if best is None or rank < best[0]:
+            best = (rank, m.group(3))
+            if rank == 0:
+                break
+    if best is not None:
+        if best[0] < 3:
+            return best[1].strip()
+        v = strings.get(best[1].strip())
         if v:
             return v.strip()
 
@@ -307,6 +386,9 @@ def parse_map_titles_from_text(text_lumps: Dict[str, str], strings: Dict[str, st
     text = "\n\n".join(combined)
     text = _strip_mapinfo_comments(text)
 
+    # Blocks come from a single brace-pairing pass rather than a scan per map.
+    opens, pairs = _match_braces(text)
+
     out: Dict[str, str] = {}
     for m in _MAP_DECL_RE.finditer(text):
         map_id = (m.group(1) or "").strip().upper()
@@ -316,10 +398,11 @@ def parse_map_titles_from_text(text_lumps: Dict[str, str], strings: Dict[str, st
         header_title = (m.group(2) or "").strip() or None
         header_lookup = (m.group(3) or "").strip() or None
 
-        block = _extract_map_block(text, m.end())
         block_text = ""
-        if block is not None:
-            block_text = block[2]
+        if not header_title:  # a header title wins without looking at the block
+            block = _extract_map_block(text, m.end(), opens, pairs)
+            if block is not None:
+                block_text = block[2]
 
         title = _pick_title_for_block(
             header_title=header_title,
@@ -413,6 +496,15 @@ DOOM1_TITLES: Dict[str, str] = {
 }
 
 
+# Marker -> LANGUAGE/BEX string key: Doom II style (MAP01 -> HUSTR_1) and
+# Doom I style (E1M1 -> HUSTR_E1M1).
+_HUSTR_KEYS: Dict[str, str] = {
+    **{f"MAP{i:02d}": f"HUSTR_{i}" for i in range(100)},
+    **{f"E{e}M{m}": f"HUSTR_E{e}M{m}" for e in range(1, 10) for m in range(1, 10)},
+}
+_VANILLA_TITLES: Dict[str, str] = {**DOOM1_TITLES, **DOOM2_TITLES}
+
+
 def fallback_title(map_marker: str, strings: Dict[str, str]) -> Optional[str]:
     """Best-effort map title without MAPINFO.
 
@@ -420,29 +512,14 @@ def fallback_title(map_marker: str, strings: Dict[str, str]) -> Optional[str]:
     """
     mm = (map_marker or "").strip().upper()
 
-    # LANGUAGE/BEX: Doom II style keys (HUSTR_1..HUSTR_32)
-    m = re.fullmatch(r"MAP(\d\d)", mm)
-    if m:
-        idx = int(m.group(1))
-        key = f"HUSTR_{idx}"
-        v = strings.get(key)
-        if v:
-            return v.strip()
-
-    # LANGUAGE/BEX: Doom I style keys (HUSTR_E1M1, etc.)
-    m = re.fullmatch(r"E([1-9])M([1-9])", mm)
-    if m:
-        key = f"HUSTR_E{m.group(1)}M{m.group(2)}"
+    key = _HUSTR_KEYS.get(mm)
+    if key:
         v = strings.get(key)
         if v:
             return v.strip()
 
     # Built-in vanilla fallbacks
-    if mm in DOOM1_TITLES:
-        return DOOM1_TITLES[mm]
-    if mm in DOOM2_TITLES:
-        return DOOM2_TITLES[mm]
-    return None
+    return _VANILLA_TITLES.get(mm)
 
 
 # -----------------------------
@@ -450,12 +527,17 @@ def fallback_title(map_marker: str, strings: Dict[str, str]) -> Optional[str]:
 # -----------------------------
 
 
-def extract_friendly_map_names(wad_path: str) -> List[str]:
-    _wad_type, _file_size, lumps = parse_wad_directory(wad_path)
+def _read_titles(wad_path: str) -> Tuple[List[str], Dict[str, str], Dict[str, str]]:
+    _wad_type, mm, lumps = parse_wad(wad_path)
+    with mm:
+        text_lumps = extract_text_lumps(mm, lumps)
     maps = detect_maps_from_lumps(lumps)
-    text_lumps = extract_text_lumps(wad_path, lumps)
     strings = build_string_table(text_lumps)
-    titles_by_map = parse_map_titles_from_text(text_lumps, strings)
+    return maps, strings, parse_map_titles_from_text(text_lumps, strings)
+
+
+def extract_friendly_map_names(wad_path: str) -> List[str]:
+    maps, strings, titles_by_map = _read_titles(wad_path)
 
     out: List[str] = []
     for m in maps:
@@ -467,11 +549,7 @@ def extract_friendly_map_names(wad_path: str) -> List[str]:
 
 
 def extract_map_title_pairs(wad_path: str) -> List[Tuple[str, str]]:
-    _wad_type, _file_size, lumps = parse_wad_directory(wad_path)
-    maps = detect_maps_from_lumps(lumps)
-    text_lumps = extract_text_lumps(wad_path, lumps)
-    strings = build_string_table(text_lumps)
-    titles_by_map = parse_map_titles_from_text(text_lumps, strings)
+    maps, strings, titles_by_map = _read_titles(wad_path)
 
     out: List[Tuple[str, str]] = []
     for m in maps:
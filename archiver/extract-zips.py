@@ -1,6 +1,11 @@
 import os
-import subprocess
 import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+# zlib releases the GIL while inflating, so threads are enough to overlap
+# extractions. Kept modest so parallel writers don't thrash the disk.
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(8, os.cpu_count() or 4))))
 
 
 def process_zip(zip_path: str, extract_dir: str):
@@ -10,21 +15,20 @@ def process_zip(zip_path: str, extract_dir: str):
     shutil.rmtree(extract_dir, ignore_errors=True)
     os.makedirs(extract_dir, exist_ok=True)
     print(f"Extracting {zip_path} to {extract_dir}...")
-    subprocess.run(
-        ["unzip", "-q", zip_path, "-d", extract_dir],
-        check=True,
-    )
+    with zipfile.ZipFile(zip_path) as z:
+        z.extractall(extract_dir)
 
 
-def extract_wad_archive(zip_dir: str, out_dir: str):
+def extract_wad_archive(zip_dir: str, out_dir: str, max_workers: int = EXTRACT_WORKERS):
     start_range = int(os.getenv("START_RANGE", "0"))
     end_range = int(os.getenv("END_RANGE", "256"))
     print(
         f"Processing WAD archive from {start_range:02x} to {end_range-1:02x}")
-    for i in range(start_range, end_range):
-        zip_path = os.path.join(zip_dir, f"{i:02x}.zip")
-        extract_dir = os.path.join(out_dir, f"{i:02x}")
-        process_zip(zip_path, extract_dir)
+    tasks = [(os.path.join(zip_dir, f"{i:02x}.zip"), os.path.join(out_dir, f"{i:02x}"))
+             for i in range(start_range, end_range)]
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for _ in ex.map(lambda t: process_zip(*t), tasks):
+            pass
 
 
 if __name__ == "__main__":
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
+import contextlib
+import hashlib
+import os
+import pickle
 import re
 import signal
 import sys
@@ -12,12 +15,21 @@ import time
 from typing import Any, Dict, List, Optional
 
 import meta
-from meta_eda import MetaJob, STREAM_NAME, subject_for_sha1
+from meta_eda import MetaJob, STREAM_NAME, json_loads, subject_for_sha1
 from natsutil import connect_nats, ensure_stream, nats_flush_timeout_seconds, nats_publish_timeout_seconds
 
 
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
 def _valid_sha1(s: str) -> bool:
-	return bool(re.fullmatch(r"[0-9a-f]{40}", (s or "").lower()))
+	"""Check an already lower-cased sha1 hex digest."""
+	return len(s) == 40 and _HEX_DIGITS.issuperset(s)
+
+
+# Cheap pre-filter on raw JSONL bytes: a line is only parsed if one of its
+# "_id" values is a sha1 we want.
+_JSONL_ID_RE = re.compile(rb'"_id"\s*:\s*"([0-9a-fA-F]{40})"')
 
 
 def _read_jsonl_lookup(*, path: str, wanted_sha1s: set[str]) -> Dict[str, Dict[str, Any]]:
@@ -26,23 +38,96 @@ def _read_jsonl_lookup(*, path: str, wanted_sha1s: set[str]) -> Dict[str, Dict[s
 	Only keeps entries whose _id exists in wanted_sha1s.
 	"""
 	lookup: Dict[str, Dict[str, Any]] = {}
-	with open(path, "r", encoding="utf-8") as f:
+	with open(path, "rb") as f:
 		for line in f:
-			line = line.strip()
-			if not line:
+			if not any(m.group(1).decode("ascii").lower() in wanted_sha1s
+					for m in _JSONL_ID_RE.finditer(line)):
 				continue
-			obj = json.loads(line)
+			obj = json_loads(line)
 			if not isinstance(obj, dict):
 				continue
+			# Membership implies validity: wanted_sha1s only holds digests.
 			sha1 = str(obj.get("_id") or "").lower()
-			if not _valid_sha1(sha1):
-				continue
 			if sha1 not in wanted_sha1s:
 				continue
 			lookup.setdefault(sha1, obj)
 	return lookup
 
 
+def _scan_jsonl_sha1s(path: str) -> set[str]:
+	"""Collect every sha1 "_id" in a JSONL file without parsing the rows.
+
+	This may include ids of nested objects too; it's only used to narrow the
+	lookups, so a superset is fine.
+	"""
+	sha1s: set[str] = set()
+	with open(path, "rb") as f:
+		for line in f:
+			for m in _JSONL_ID_RE.finditer(line):
+				sha1s.add(m.group(1).decode("ascii").lower())
+	return sha1s
+
+
+_LOOKUP_CACHE_PREFIX = "dorch-dispatch-lookups-"
+
+
+def _file_sha256(path: str) -> str:
+	with open(path, "rb") as f:
+		return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _load_wad_lookups(
+	*, wads_json: str, idgames_json: str, cache_dir: Optional[str]
+) -> tuple[set[str], Dict[str, Dict[str, Any]]]:
+	"""Return (wad sha1s, idgames lookup), cached on disk between runs.
+
+	The cache is keyed by a digest of both inputs' contents, so a re-download
+	of unchanged files still hits and any edit rebuilds it. Only the newest
+	cache file is kept. A missing or unreadable cache is rebuilt.
+	"""
+	cache_path = None
+	if cache_dir:
+		key = f"v2:{_file_sha256(wads_json)}:{_file_sha256(idgames_json)}"
+		digest = hashlib.sha1(key.encode("ascii")).hexdigest()[:16]
+		cache_path = os.path.join(cache_dir, f"{_LOOKUP_CACHE_PREFIX}{digest}.pickle")
+		try:
+			with open(cache_path, "rb") as f:
+				wad_sha1s, id_lookup = pickle.load(f)
+			print(f"📦 Loaded cached lookups from {cache_path}", file=sys.stderr)
+			return wad_sha1s, id_lookup
+		except FileNotFoundError:
+			pass
+		except Exception as ex:
+			print(f"⚠️ Ignoring unreadable lookup cache {cache_path}: {type(ex).__name__}: {ex}", file=sys.stderr)
+
+	idgames_data = meta.read_json_file(idgames_json)
+	if not isinstance(idgames_data, list):
+		raise SystemExit("idgames.json must be a JSON array")
+	wad_sha1s = _scan_jsonl_sha1s(wads_json)
+	id_lookup = meta.build_idgames_lookup(idgames_data, wad_sha1s)
+
+	if cache_path is not None:
+		tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+		try:
+			# The cache is unpickled on load, so keep it out of reach of other users.
+			os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+			with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+				pickle.dump((wad_sha1s, id_lookup), f, protocol=pickle.HIGHEST_PROTOCOL)
+			os.replace(tmp_path, cache_path)
+		except OSError as ex:
+			print(f"⚠️ Could not write lookup cache {cache_path}: {ex}", file=sys.stderr)
+			with contextlib.suppress(OSError):
+				os.unlink(tmp_path)
+		else:
+			# Caches for older inputs can never hit again.
+			for entry in os.scandir(cache_dir):
+				if (entry.name.startswith(_LOOKUP_CACHE_PREFIX) and entry.name.endswith(".pickle")
+						and entry.path != cache_path):
+					with contextlib.suppress(OSError):
+						os.unlink(entry.path)
+	return wad_sha1s, id_lookup
+
+
 def _drop_zero_linedef_maps_inplace(obj: Dict[str, Any]) -> None:
 	"""Best-effort cleanup for payloads that already include per-map stats.
 
@@ -118,43 +203,36 @@ async def _run(args: argparse.Namespace) -> None:
 	except NotImplementedError:
 		pass
 
-	# Load inputs (support URL like meta.py)
-	wads_json = args.wads_json
-	idgames_json = args.idgames_json
-	readmes_json = args.readmes_json
-	filenames_json = args.filenames_json
-	additional_json = args.additional_json
-	if meta.is_http_url(wads_json):
-		meta.eprint(f"📥 Downloading wads.json: {wads_json} -> /tmp/wads.json")
-		meta.download_url_to_file(wads_json, "/tmp/wads.json")
-		wads_json = "/tmp/wads.json"
-	if meta.is_http_url(idgames_json):
-		meta.eprint(f"📥 Downloading idgames.json: {idgames_json} -> /tmp/idgames.json")
-		meta.download_url_to_file(idgames_json, "/tmp/idgames.json")
-		idgames_json = "/tmp/idgames.json"
-	if meta.is_http_url(readmes_json):
-		meta.eprint(f"📥 Downloading readmes.json: {readmes_json} -> /tmp/readmes.json")
-		meta.download_url_to_file(readmes_json, "/tmp/readmes.json")
-		readmes_json = "/tmp/readmes.json"
-	if meta.is_http_url(filenames_json):
-		meta.eprint(f"📥 Downloading filenames.json: {filenames_json} -> /tmp/filenames.json")
-		meta.download_url_to_file(filenames_json, "/tmp/filenames.json")
-		filenames_json = "/tmp/filenames.json"
-	if meta.is_http_url(additional_json):
-		meta.eprint(f"📥 Downloading additional.json: {additional_json} -> /tmp/additional.json")
-		meta.download_url_to_file(additional_json, "/tmp/additional.json")
-		additional_json = "/tmp/additional.json"
+	# Load inputs (support URL like meta.py). Remote inputs are fetched
+	# concurrently, so startup waits on the slowest download, not their sum.
+	inputs = {
+		"wads.json": args.wads_json,
+		"idgames.json": args.idgames_json,
+		"readmes.json": args.readmes_json,
+		"filenames.json": args.filenames_json,
+		"additional.json": args.additional_json,
+	}
+	downloads = []
+	for label, url in inputs.items():
+		if meta.is_http_url(url):
+			dest = f"/tmp/{label}"
+			meta.eprint(f"📥 Downloading {label}: {url} -> {dest}")
+			downloads.append(asyncio.to_thread(meta.download_url_to_file, url, dest))
+			inputs[label] = dest
+	await asyncio.gather(*downloads)
+	wads_json = inputs["wads.json"]
+	idgames_json = inputs["idgames.json"]
+	readmes_json = inputs["readmes.json"]
+	filenames_json = inputs["filenames.json"]
+	additional_json = inputs["additional.json"]
 	print("📄 Loading JSON data...", file=sys.stderr)
-	wads_data = meta.read_json_file(wads_json)
-	idgames_data = meta.read_json_file(idgames_json)
-	if not isinstance(wads_data, list):
-		raise SystemExit("wads.json must be a JSON array")
-	if not isinstance(idgames_data, list):
-		raise SystemExit("idgames.json must be a JSON array")
-
-	# Build idgames lookup keyed by sha1.
-	wad_sha1s = {str(w.get("_id", "")).lower() for w in wads_data if isinstance(w, dict) and w.get("_id")}
-	id_lookup = meta.build_idgames_lookup(idgames_data, wad_sha1s)
+	# wads.json is streamed twice rather than held in memory: once here for
+	# the sha1s the lookups are filtered by, then again while dispatching.
+	wad_sha1s, id_lookup = _load_wad_lookups(
+		wads_json=wads_json,
+		idgames_json=idgames_json,
+		cache_dir=args.lookup_cache_dir or None,
+	)
 	readme_lookup = _read_jsonl_lookup(path=readmes_json, wanted_sha1s=wad_sha1s)
 	filenames_lookup = _read_jsonl_lookup(path=filenames_json, wanted_sha1s=wad_sha1s)
 	additional_lookup = _read_jsonl_lookup(path=additional_json, wanted_sha1s=wad_sha1s)
@@ -165,17 +243,36 @@ async def _run(args: argparse.Namespace) -> None:
 		await ensure_stream(js, STREAM_NAME, subjects=["dorch.wad.*.meta"])
 
 		publish_timeout = nats_publish_timeout_seconds()
+		flush_timeout = nats_flush_timeout_seconds()
+		# With --flush-every, jobs go out as core NATS publishes captured by
+		# the stream and are only confirmed by a periodic flush. Msg-Id lets
+		# JetStream drop duplicates if a batch has to be dispatched again.
+		flush_every = max(0, int(args.flush_every))
 
-		total = len(wads_data)
 		start = max(0, int(args.start))
-		end = total if args.limit <= 0 else min(total, start + int(args.limit))
+		end = None if args.limit <= 0 else start + int(args.limit)
 
+		# Keep up to --max-inflight publishes awaiting their PubAck at once so
+		# throughput isn't capped at one job per NATS round trip.
+		window = asyncio.Semaphore(max(1, int(args.max_inflight)))
+		inflight: set[asyncio.Task] = set()
+		errors: List[BaseException] = []
 		published = 0
-		for idx in range(start, end):
-			if shutdown.is_set():
+
+		async def _publish(subj: str, payload: bytes, headers: Dict[str, str]) -> None:
+			nonlocal published
+			try:
+				await js.publish(subj, payload, headers=headers, timeout=publish_timeout)
+				published += 1
+			except Exception as ex:
+				errors.append(ex)
+			finally:
+				window.release()
+
+		for _idx, wad_entry in meta.iter_json_file(wads_json, start, end):
+			if shutdown.is_set() or errors:
 				break
 
-			wad_entry = wads_data[idx]
 			if not isinstance(wad_entry, dict):
 				continue
 			sha1 = str(wad_entry.get("_id") or "").lower()
@@ -200,15 +297,32 @@ async def _run(args: argparse.Namespace) -> None:
 			_drop_zero_linedef_maps_inplace(job.wad_entry)
 
 			subj = subject_for_sha1(sha1)
-			headers = {} #{"Nats-Msg-Id": f"dorch-meta:{sha1}"} # TODO
-			await js.publish(subj, job.to_bytes(), headers=headers, timeout=publish_timeout)
-			published += 1
+			if flush_every:
+				await nc.publish(subj, job.to_bytes(), headers={"Nats-Msg-Id": f"dorch-meta:{sha1}"})
+				published += 1
+				if published % flush_every == 0:
+					await nc.flush(timeout=flush_timeout)
+			else:
+				headers = {} #{"Nats-Msg-Id": f"dorch-meta:{sha1}"} # TODO
+				await window.acquire()
+				task = asyncio.create_task(_publish(subj, job.to_bytes(), headers))
+				inflight.add(task)
+				task.add_done_callback(inflight.discard)
+				if args.sleep > 0:
+					# Paced mode stays serial: wait for the ack before sleeping.
+					await task
 			if args.sleep > 0:
 				try:
 					await asyncio.wait_for(shutdown.wait(), timeout=args.sleep)
 				except asyncio.TimeoutError:
 					pass
 
+		# Wait for outstanding acks; the first failed publish is raised.
+		await asyncio.gather(*inflight)
+		if errors:
+			raise errors[0]
+		if flush_every:
+			await nc.flush(timeout=flush_timeout)
 		print(f"📨 Dispatched {published} jobs to stream {STREAM_NAME}")
 	finally:
 		if fast_exit:
@@ -231,6 +345,25 @@ def main() -> None:
 	ap.add_argument("--limit", type=int, default=0, help="Dispatch only N wads (0 = all)")
 	ap.add_argument("--start", type=int, default=0, help="Start index into wads.json array")
 	ap.add_argument("--sleep", type=float, default=0.0, help="Sleep seconds between publishes")
+	ap.add_argument(
+		"--max-inflight",
+		"--publish-batch",
+		dest="max_inflight",
+		type=int,
+		default=256,
+		help="Max publishes awaiting an ack at once",
+	)
+	ap.add_argument(
+		"--flush-every",
+		type=int,
+		default=0,
+		help="Publish without waiting for PubAcks, flushing every N jobs (0 = await acks)",
+	)
+	ap.add_argument(
+		"--lookup-cache-dir",
+		default=os.getenv("DORCH_DISPATCH_CACHE_DIR", ""),
+		help="Private directory to cache the sha1/idgames lookups in (default: no cache)",
+	)
 	ap.add_argument("--smoke-test-id", default=None, help="Only dispatch SHA1s containing this substring")
 	args = ap.parse_args()
 
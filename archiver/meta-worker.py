@@ -7,15 +7,28 @@ import asyncio
 import contextlib
 import os
 import re
+import shutil
 import signal
 import struct
 import sys
 import tempfile
+import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import boto3
+from botocore.config import Config
+
+try:
+	from aiobotocore.config import AioConfig  # type: ignore
+	from aiobotocore.session import get_session as _aio_session  # type: ignore
+
+	_AIOBOTOCORE_AVAILABLE = True
+except Exception:  # pragma: no cover
+	# Optional: without it, downloads run on threads through boto3.
+	_AIOBOTOCORE_AVAILABLE = False
 
 _PROM_AVAILABLE = False
 try:
@@ -27,23 +40,33 @@ except Exception:
 	_PROM_AVAILABLE = False
 
 import meta
-from meta_eda import STREAM_NAME, parse_meta_job, sha1_from_subject
+from meta_eda import STREAM_NAME, WadEntryInfo, parse_meta_job, sha1_from_subject, wad_entry_info
 from natsutil import connect_nats, ensure_stream, nats_flush_timeout_seconds
 from screenshots import RenderConfig, render_screenshots
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 _REDIS_EXECUTOR = ThreadPoolExecutor(max_workers=2)
 
 def _cache_redis_file_sync(redis_client, redis_key, buf):
     try:
-        redis_client.set(redis_key, buf, ex=90 * 60)
+        # Redelivered or re-queued WADs are usually cached already; a one-byte
+        # EXISTS reply is far cheaper than shipping the blob again.
+        if redis_client.exists(redis_key):
+            return
+        redis_client.set(redis_key, buf, ex=90 * 60, nx=True)
     except Exception as ex:
         meta.eprint(f"⚠️ Redis SET failed for {redis_key}: {type(ex).__name__}: {ex}")
 
 _REDIS_CLIENT: Any = None
+# After a failed connect, Redis is skipped until this monotonic time instead
+# of for the rest of the process.
+_REDIS_RETRY_AT = 0.0
+_REDIS_RETRY_SECONDS = 60.0
 
 
-_MAX_REDIS_CACHE_BYTES = 300 * 1024 * 1024  # 300MB
+# Larger objects aren't held in memory for caching; the download already
+# knows the size up front, so this costs no extra request.
+_MAX_REDIS_CACHE_BYTES = 64 * 1024 * 1024  # 64MB
 
 
 def _maybe_start_prometheus_http_server(*, worker: str) -> None:
@@ -102,22 +125,21 @@ def _dedupe_per_map_stats_keep_last(
 	if not isinstance(per_map_stats, list) or not per_map_stats:
 		return []
 
-	seen: set[str] = set()
-	out_rev: List[Dict[str, Any]] = []
-	for m in reversed(per_map_stats):
+	# Re-inserting a key moves it to the end, so the result keeps the order
+	# of each map's last occurrence.
+	out: Dict[str, Dict[str, Any]] = {}
+	for m in per_map_stats:
 		if not isinstance(m, dict):
 			continue
 		name = m.get("map")
 		if not isinstance(name, str):
 			continue
 		key = name.strip().upper()
-		if not key or key in seen:
+		if not key:
 			continue
-		seen.add(key)
-		out_rev.append(m)
-
-	out_rev.reverse()
-	return out_rev
+		out.pop(key, None)
+		out[key] = m
+	return list(out.values())
 
 
 def _dedupe_text_files_by_stripped_contents(
@@ -219,9 +241,11 @@ def _get_redis_client() -> Optional[Any]:
 
 	Returns None if Redis isn't configured or redis-py isn't installed.
 	"""
-	global _REDIS_CLIENT
+	global _REDIS_CLIENT, _REDIS_RETRY_AT
 	if _REDIS_CLIENT is not None:
 		return _REDIS_CLIENT if _REDIS_CLIENT is not False else None
+	if time.monotonic() < _REDIS_RETRY_AT:
+		return None
 
 	try:
 		import redis  # type: ignore
@@ -243,22 +267,35 @@ def _get_redis_client() -> Optional[Any]:
 	proto = (os.getenv("REDIS_PROTO") or "redis").strip().lower()
 	use_ssl = proto == "rediss"
 
+	# A shared pool lets concurrent jobs (and the cache executor) issue
+	# commands in parallel instead of queueing on one connection.
+	pool_kwargs: Dict[str, Any] = dict(
+		host=host,
+		port=port,
+		username=username,
+		password=password,
+		max_connections=max(1, _env_int("DORCH_REDIS_POOL", 16)),
+		timeout=5,
+		socket_connect_timeout=2,
+		socket_timeout=30,
+		socket_keepalive=True,
+		# Pooled connections can sit idle between jobs; check them before use.
+		health_check_interval=30,
+	)
+	if use_ssl:
+		pool_kwargs["connection_class"] = redis.SSLConnection
 	try:
-		client = redis.Redis(
-			host=host,
-			port=port,
-			username=username,
-			password=password,
-			ssl=use_ssl,
-			decode_responses=False,
-			socket_connect_timeout=2,
-			socket_timeout=30,
-		)
+		pool = redis.BlockingConnectionPool(**pool_kwargs)
+		client = redis.Redis(connection_pool=pool)
+		client.ping()
 		_REDIS_CLIENT = client
 		return client
 	except Exception as ex:
-		meta.eprint(f"⚠️ Redis disabled (connect failed): {type(ex).__name__}: {ex}")
-		_REDIS_CLIENT = False
+		meta.eprint(
+			f"⚠️ Redis unavailable (connect failed), retrying in {_REDIS_RETRY_SECONDS:.0f}s: "
+			f"{type(ex).__name__}: {ex}"
+		)
+		_REDIS_RETRY_AT = time.monotonic() + _REDIS_RETRY_SECONDS
 		return None
 
 
@@ -285,8 +322,50 @@ def _env_str(name: str, default: str) -> str:
 	return (v.strip() if v is not None else "") or default
 
 
+@dataclass(frozen=True, slots=True)
+class WorkerConfig:
+	"""Worker settings, read from the environment once at startup."""
+
+	region_name: Optional[str]
+	wad_bucket: str
+	wad_endpoint: str
+	images_bucket: str
+	images_endpoint: str
+	post_to_wadinfo: bool
+	wadinfo_base_url: str
+	render_screens: bool
+	upload_screens: bool
+	screenshot_width: int
+	screenshot_height: int
+	screenshot_count: int
+	panorama: bool
+
+	@classmethod
+	def from_env(cls) -> "WorkerConfig":
+		return cls(
+			region_name=os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION"),
+			wad_bucket=_env_str("DORCH_WAD_BUCKET", "wadarchive2"),
+			wad_endpoint=_env_str("DORCH_WAD_ENDPOINT", "https://nyc3.digitaloceanspaces.com"),
+			images_bucket=_env_str("DORCH_IMAGES_BUCKET", "wadimages2"),
+			images_endpoint=_env_str("DORCH_IMAGES_ENDPOINT", "https://nyc3.digitaloceanspaces.com"),
+			post_to_wadinfo=_env_bool("DORCH_POST_TO_WADINFO", True),
+			wadinfo_base_url=_env_str("WADINFO_BASE_URL", "http://localhost:8000"),
+			render_screens=_env_bool("DORCH_RENDER_SCREENSHOTS", False),
+			upload_screens=_env_bool("DORCH_UPLOAD_SCREENSHOTS", False),
+			screenshot_width=_env_int("DORCH_SCREENSHOT_WIDTH", 800),
+			screenshot_height=_env_int("DORCH_SCREENSHOT_HEIGHT", 600),
+			screenshot_count=_env_int("DORCH_SCREENSHOT_COUNT", 5),
+			panorama=_env_bool("DORCH_PANORAMA", False),
+		)
+
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
 def _valid_sha1(s: str) -> bool:
-	return bool(re.fullmatch(r"[0-9a-f]{40}", (s or "").lower()))
+	# A set check, with no regex call or lower-cased copy, since this runs
+	# several times per message.
+	return isinstance(s, str) and len(s) == 40 and _HEX_DIGITS.issuperset(s)
 
 
 # -----------------------------
@@ -328,8 +407,38 @@ def _normalize_whitespace(s: str) -> str:
 
 
 def _strip_mapinfo_comments(text: str) -> str:
-	text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
-	text = re.sub(r"//.*?$", "", text, flags=re.MULTILINE)
+	# Remove /* ... */ blocks first, then // line comments. Both passes hop
+	# between delimiters with str.find instead of running a lazy regex.
+	parts: List[str] = []
+	pos = 0
+	while True:
+		start = text.find("/*", pos)
+		if start < 0:
+			break
+		end = text.find("*/", start + 2)
+		if end < 0:
+			break  # unterminated block comment is left as-is
+		parts.append(text[pos:start])
+		pos = end + 2
+	if pos:
+		parts.append(text[pos:])
+		text = "".join(parts)
+
+	parts = []
+	pos = 0
+	while True:
+		start = text.find("//", pos)
+		if start < 0:
+			break
+		parts.append(text[pos:start])
+		end = text.find("\n", start + 2)
+		if end < 0:
+			pos = len(text)
+			break
+		pos = end
+	if parts:
+		parts.append(text[pos:])
+		text = "".join(parts)
 	return text
 
 
@@ -455,15 +564,19 @@ _MAP_DECL_RE = re.compile(
 
 
 def _find_matching_brace(text: str, open_brace_pos: int) -> Optional[int]:
+	# Hop between braces with str.find (C-speed) rather than walking every char.
 	depth = 0
-	for i in range(open_brace_pos, len(text)):
-		c = text[i]
-		if c == "{":
+	next_open = text.find("{", open_brace_pos)
+	next_close = text.find("}", open_brace_pos)
+	while next_close >= 0:
+		if 0 <= next_open < next_close:
 			depth += 1
-		elif c == "}":
+			next_open = text.find("{", next_open + 1)
+		else:
 			depth -= 1
 			if depth == 0:
-				return i
+				return next_close
+			next_close = text.find("}", next_close + 1)
 	return None
 
 
@@ -605,18 +718,17 @@ _DOOM1_TITLES: Dict[str, str] = {
 }
 
 
+# Marker -> LANGUAGE/BEX string key (MAP01 -> HUSTR_1, E1M1 -> HUSTR_E1M1).
+_HUSTR_KEYS: Dict[str, str] = {
+	**{f"MAP{i:02d}": f"HUSTR_{i}" for i in range(100)},
+	**{f"E{e}M{m}": f"HUSTR_E{e}M{m}" for e in range(1, 10) for m in range(1, 10)},
+}
+
+
 def _fallback_title(map_marker: str, strings: Dict[str, str]) -> Optional[str]:
 	mm = (map_marker or "").strip().upper()
-	m = re.fullmatch(r"MAP(\d\d)", mm)
-	if m:
-		idx = int(m.group(1))
-		key = f"HUSTR_{idx}"
-		v = strings.get(key)
-		if v:
-			return v.strip()
-	m = re.fullmatch(r"E([1-9])M([1-9])", mm)
-	if m:
-		key = f"HUSTR_E{m.group(1)}M{m.group(2)}"
+	key = _HUSTR_KEYS.get(mm)
+	if key:
 		v = strings.get(key)
 		if v:
 			return v.strip()
@@ -652,6 +764,304 @@ def _attach_map_titles(per_map_stats: List[Dict[str, Any]], titles_by_map_upper:
 		title = titles_by_map_upper.get(key) or name.strip()
 		m["title"] = title
 
+def _render_and_upload_screenshots(
+	*,
+	sha1: str,
+	wad_entry: Dict[str, Any],
+	wad_info: WadEntryInfo,
+	extracted: Dict[str, Any],
+	ext: str,
+	file_path: str,
+	output_path: str,
+	cfg: WorkerConfig,
+) -> None:
+	"""Best-effort screenshot render + upload; failures are only logged."""
+	try:
+		# Deduce IWAD for rendering.
+		if wad_info.wad_type_upper == "IWAD" and ext == "wad":
+			iwad_path = Path(file_path)
+			files_for_render: List[Path] = []
+		else:
+			iwad_path = meta.deduce_iwad_path_from_meta(wad_entry, extracted)
+			files_for_render = [Path(file_path)]
+
+		if cfg.upload_screens:
+			os.makedirs(output_path, exist_ok=True)
+			config = RenderConfig(
+				iwad=iwad_path,
+				files=files_for_render,
+				output=Path(output_path),
+				num=cfg.screenshot_count,
+				width=cfg.screenshot_width,
+				height=cfg.screenshot_height,
+				panorama=cfg.panorama,
+				invulnerable=True,
+			)
+			render_screenshots(config)
+			meta.upload_screenshots(
+				sha1=sha1,
+				path=output_path,
+				bucket=cfg.images_bucket,
+				endpoint=cfg.images_endpoint,
+			)
+	except Exception as ex:
+		meta.eprint(f"⚠️ Screenshot rendering/upload failed for {sha1}: {type(ex).__name__}: {ex}")
+
+
+def _tmp_base() -> Optional[str]:
+	tmp_base = (os.getenv("DORCH_TMP_PATH") or "").strip() or None
+	if tmp_base is not None:
+		os.makedirs(tmp_base, exist_ok=True)
+	return tmp_base
+
+
+def _clear_dir(path: str) -> None:
+	for entry in os.scandir(path):
+		if entry.is_dir(follow_symlinks=False):
+			shutil.rmtree(entry.path, ignore_errors=True)
+		else:
+			with contextlib.suppress(OSError):
+				os.unlink(entry.path)
+
+
+@contextlib.contextmanager
+def _job_dir(work_dir: Optional[str]):
+	"""Yield a scratch directory for one job.
+
+	A pooled work_dir is emptied afterwards and kept for the next job;
+	without one a fresh temporary directory is created and removed.
+	"""
+	if work_dir is None:
+		with tempfile.TemporaryDirectory(prefix="dorch_meta_", dir=_tmp_base()) as td:
+			yield td
+		return
+	try:
+		yield work_dir
+	finally:
+		_clear_dir(work_dir)
+
+
+_RENDER_EXECUTOR = ThreadPoolExecutor(
+	max_workers=max(1, _env_int("DORCH_META_WORKERS", 4)),
+	thread_name_prefix="render",
+)
+
+# Per-map stats for WADs embedded in a PK3 are parsed in worker processes
+# (one per core, up to 8) so several can run at once despite the GIL.
+# DORCH_CPU_WORKERS=0 disables it.
+_CPU_WORKERS = _env_int("DORCH_CPU_WORKERS", meta.default_cpu_workers())
+_CPU_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _cpu_pool() -> Optional[ProcessPoolExecutor]:
+	global _CPU_POOL
+	if _CPU_POOL is None and _CPU_WORKERS > 0:
+		_CPU_POOL = meta.new_cpu_pool(_CPU_WORKERS)
+	return _CPU_POOL
+
+
+def _warm_cpu_pool() -> None:
+	"""Start every worker process and import meta in it ahead of the first job."""
+	pool = _cpu_pool()
+	if pool is None:
+		return
+	for f in [pool.submit(meta.default_cpu_workers) for _ in range(_CPU_WORKERS)]:
+		f.result()
+
+
+def _per_map_stats_for_embedded(embedded: List[Tuple[str, bytes]]) -> List[List[Dict[str, Any]]]:
+	return meta.per_map_stats_for_embedded(embedded, _cpu_pool() if len(embedded) > 1 else None)
+
+
+def _wad_ext(wad_info: WadEntryInfo) -> str:
+	return meta.TYPE_TO_EXT.get(wad_info.wad_type, None) or "wad"
+
+
+# Content-addressed cache of decompressed WADs on local disk, laid out as
+# {DORCH_CACHE}/{sha1[:2]}/{sha1}.{ext}. Hits are hard-linked into the job
+# dir, so nothing is copied; least recently used files are evicted once the
+# cache outgrows DORCH_CACHE_BYTES. DORCH_CACHE="" disables it.
+_DISK_CACHE_DIR: Optional[str] = (os.getenv("DORCH_CACHE", "/var/cache/dorch") or "").strip() or None
+_DISK_CACHE_BYTES = _env_int("DORCH_CACHE_BYTES", 20 * 1024 * 1024 * 1024)
+_DISK_CACHE_TRIM_LOCK = threading.Lock()
+
+
+def _disk_cache_path(file_path: str) -> Optional[str]:
+	global _DISK_CACHE_DIR
+	if _DISK_CACHE_DIR is None:
+		return None
+	name = os.path.basename(file_path)
+	shard = os.path.join(_DISK_CACHE_DIR, name[:2])
+	try:
+		os.makedirs(shard, exist_ok=True)
+	except OSError as ex:
+		meta.eprint(f"⚠️ Disabling WAD disk cache at {_DISK_CACHE_DIR}: {type(ex).__name__}: {ex}")
+		_DISK_CACHE_DIR = None
+		return None
+	return os.path.join(shard, name)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+	try:
+		os.link(src, dst)
+	except FileNotFoundError:
+		raise
+	except OSError:
+		# e.g. the cache and the job dir are on different filesystems.
+		shutil.copyfile(src, dst)
+
+
+def _trim_disk_cache() -> None:
+	"""Evict least recently used cache files until under DORCH_CACHE_BYTES."""
+	if _DISK_CACHE_DIR is None or not _DISK_CACHE_TRIM_LOCK.acquire(blocking=False):
+		return
+	try:
+		entries: List[Tuple[float, int, str]] = []
+		total = 0
+		for shard in os.scandir(_DISK_CACHE_DIR):
+			if not shard.is_dir(follow_symlinks=False):
+				continue
+			for entry in os.scandir(shard.path):
+				with contextlib.suppress(OSError):
+					st = entry.stat(follow_symlinks=False)
+					entries.append((st.st_mtime, st.st_size, entry.path))
+					total += st.st_size
+		if total <= _DISK_CACHE_BYTES:
+			return
+		entries.sort()
+		for _mtime, size, path in entries:
+			if total <= _DISK_CACHE_BYTES:
+				break
+			# Jobs still holding a hard link keep their copy of the inode.
+			with contextlib.suppress(OSError):
+				os.unlink(path)
+				total -= size
+	except Exception as ex:
+		meta.eprint(f"⚠️ WAD disk cache trim failed: {type(ex).__name__}: {ex}")
+	finally:
+		_DISK_CACHE_TRIM_LOCK.release()
+
+
+def _take_cached_wad(file_path: str) -> Tuple[Optional[str], bool]:
+	"""Return (disk cache path or None, whether file_path was filled from it)."""
+	cached = _disk_cache_path(file_path)
+	if cached is not None:
+		try:
+			_link_or_copy(cached, file_path)
+			os.utime(cached)  # recently used, for eviction
+			print(f"📦 Using cached {cached}", file=sys.stderr)
+			return cached, True
+		except FileNotFoundError:
+			pass
+	return cached, False
+
+
+def _store_downloaded_wad(*, cached: Optional[str], file_path: str, sha1: str, redis_client, buf: Optional[bytes]) -> None:
+	if cached is not None:
+		# Written to a temp file and renamed into place, so concurrent jobs
+		# for the same WAD never see a partial file.
+		_link_or_copy(cached, file_path)
+		_REDIS_EXECUTOR.submit(_trim_disk_cache)
+	if buf is not None:
+		# The cache holds the gzipped object as stored in S3, not the WAD itself.
+		_REDIS_EXECUTOR.submit(_cache_redis_file_sync, redis_client, f"dorch:wad:{sha1}.gz", buf)
+
+
+def _download_wad(*, s3_wads, bucket: str, s3_key: str, sha1: str, file_path: str) -> Optional[Dict[str, str]]:
+	"""Fill file_path from the disk cache or S3.
+
+	Returns the WAD's hashes when it was downloaded (they are computed in
+	the stream), or None for a cache hit.
+	"""
+	cached, hit = _take_cached_wad(file_path)
+	if hit:
+		return None
+	# With the disk cache on, Redis would only hold a second copy.
+	redis_client = _get_redis_client() if cached is None else None
+	# Decompressed while downloading; the .gz itself is only kept in memory
+	# when it is small enough to cache.
+	print(f"📥 Downloading s3://{bucket}/{s3_key}", file=sys.stderr)
+	hashes: Dict[str, str] = {}
+	buf = meta.download_s3_gunzipped_to_path(
+		s3_wads,
+		bucket,
+		s3_key,
+		cached or file_path,
+		keep_compressed_below=_MAX_REDIS_CACHE_BYTES if redis_client is not None else 0,
+		hashes=hashes,
+	)
+	_store_downloaded_wad(cached=cached, file_path=file_path, sha1=sha1, redis_client=redis_client, buf=buf)
+	return hashes
+
+
+def prefetch_wad(
+	*,
+	sha1: str,
+	wad_entry: Dict[str, Any],
+	s3_wads,
+	cfg: WorkerConfig,
+	work_dir: str,
+	wad_info: Optional[WadEntryInfo] = None,
+) -> Tuple[str, Optional[Dict[str, str]]]:
+	"""Download and gunzip a job's WAD into work_dir ahead of analysis.
+
+	Returns (S3 key, hashes or None), to be passed on as analyze_one_wad's
+	prefetched_key and prefetched_hashes with the same work_dir.
+	"""
+	sha1 = sha1.lower()
+	ext = _wad_ext(wad_info or wad_entry_info(wad_entry))
+	s3_key = meta.resolve_s3_key(s3_wads, cfg.wad_bucket, sha1, ext)
+	hashes = _download_wad(
+		s3_wads=s3_wads,
+		bucket=cfg.wad_bucket,
+		s3_key=s3_key,
+		sha1=sha1,
+		file_path=os.path.join(work_dir, f"{sha1}.{ext}"),
+	)
+	return s3_key, hashes
+
+
+async def prefetch_wad_async(
+	*,
+	sha1: str,
+	wad_entry: Dict[str, Any],
+	s3_wads,
+	s3_aio,
+	cfg: WorkerConfig,
+	work_dir: str,
+	wad_info: Optional[WadEntryInfo] = None,
+) -> Tuple[str, Optional[Dict[str, str]]]:
+	"""prefetch_wad, with the object GETs on the event loop via aiobotocore.
+
+	The key lookup still goes through s3_wads and meta.resolve_s3_key, so
+	both paths probe the same layouts.
+	"""
+	sha1 = sha1.lower()
+	ext = _wad_ext(wad_info or wad_entry_info(wad_entry))
+	s3_key = await asyncio.to_thread(meta.resolve_s3_key, s3_wads, cfg.wad_bucket, sha1, ext)
+	file_path = os.path.join(work_dir, f"{sha1}.{ext}")
+	# The cache helpers may copy a whole WAD across filesystems, and
+	# _get_redis_client may block on a connect, so none run on the loop.
+	cached, hit = await asyncio.to_thread(_take_cached_wad, file_path)
+	if hit:
+		return s3_key, None
+	redis_client = await asyncio.to_thread(_get_redis_client) if cached is None else None
+	print(f"📥 Downloading s3://{cfg.wad_bucket}/{s3_key}", file=sys.stderr)
+	hashes: Dict[str, str] = {}
+	buf = await meta.download_s3_gunzipped_to_path_async(
+		s3_aio,
+		cfg.wad_bucket,
+		s3_key,
+		cached or file_path,
+		keep_compressed_below=_MAX_REDIS_CACHE_BYTES if redis_client is not None else 0,
+		hashes=hashes,
+	)
+	await asyncio.to_thread(
+		_store_downloaded_wad, cached=cached, file_path=file_path, sha1=sha1, redis_client=redis_client, buf=buf
+	)
+	return s3_key, hashes
+
+
 def analyze_one_wad(
 	*,
 	sha1: str,
@@ -661,147 +1071,106 @@ def analyze_one_wad(
 	filenames_entry: Optional[Dict[str, Any]] = None,
 	additional_entry: Optional[Dict[str, Any]] = None,
 	s3_wads,
-	wad_bucket: str,
-	post_to_wadinfo: bool,
-	wadinfo_base_url: str,
-	render_screens: bool,
-	upload_screens: bool,
-	screenshot_width: int,
-	screenshot_height: int,
-	screenshot_count: int,
-	panorama: bool,
-	images_bucket: str,
-	images_endpoint: str,
+	cfg: WorkerConfig,
+	work_dir: Optional[str] = None,
+	prefetched_key: Optional[str] = None,
+	prefetched_hashes: Optional[Dict[str, str]] = None,
+	wad_info: Optional[WadEntryInfo] = None,
 ) -> Dict[str, Any]:
 	sha1 = sha1.lower()
 	if not _valid_sha1(sha1):
 		raise ValueError("sha1 must be 40 hex chars")
 	if not isinstance(wad_entry, dict):
 		raise ValueError("wad_entry must be a dict")
-
-	redis_client = _get_redis_client()
-	redis_key = f"dorch:wad:{sha1}"
-
-	wad_type = str(wad_entry.get("type") or "UNKNOWN")
-	ext = meta.TYPE_TO_EXT.get(wad_type, None) or "wad"
-
-	s3_key = meta.resolve_s3_key(s3_wads, wad_bucket, sha1, ext)
+	if wad_info is None:
+		wad_info = wad_entry_info(wad_entry)
+
+	ext = _wad_ext(wad_info)
+
+	wad_bucket = cfg.wad_bucket
+	if prefetched_key is not None:
+		if work_dir is None:
+			raise ValueError("prefetched_key requires the work_dir it was prefetched into")
+		s3_key = prefetched_key
+	else:
+		s3_key = meta.resolve_s3_key(s3_wads, wad_bucket, sha1, ext)
 	s3_url = f"s3://{wad_bucket}/{s3_key}" if s3_key else None
 
-	expected_hashes = wad_entry.get("hashes") or {}
-	expected_sha256 = None
-	if isinstance(expected_hashes, dict):
-		v = expected_hashes.get("sha256")
-		if isinstance(v, str) and v.strip():
-			expected_sha256 = v.strip().lower()
-
 	computed_hashes: Optional[Dict[str, str]] = None
 	integrity: Optional[Dict[str, Any]] = None
 	extracted: Dict[str, Any] = {}
 	per_map_stats: List[Dict[str, Any]] = []
 	map_titles_by_upper: Dict[str, str] = {}
 
-	tmp_base = (os.getenv("DORCH_TMP_PATH") or "").strip() or None
-	if tmp_base is not None:
-		os.makedirs(tmp_base, exist_ok=True)
-
-	with tempfile.TemporaryDirectory(prefix="dorch_meta_", dir=tmp_base) as td:
-		gz_path = os.path.join(td, f"{sha1}.{ext}.gz")
+	with _job_dir(work_dir) as td:
 		file_path = os.path.join(td, f"{sha1}.{ext}")
 		output_path = os.path.join(td, "output_screenshots")
 
 		try:
-			cached_bytes: Optional[bytes] = None
-			#if redis_client is not None:
-			#	try:
-			#		v = redis_client.get(redis_key)
-			#		if v is not None:
-			#			cached_bytes = bytes(v)
-			#	except Exception as ex:
-			#		meta.eprint(f"Redis GET failed for {redis_key}: {type(ex).__name__}: {ex}")
-
-			if cached_bytes is not None:
-				with open(file_path, "wb") as f:
-					f.write(cached_bytes)
+			# Hashes come from the download stream when there was one.
+			streamed_hashes: Optional[Dict[str, str]] = None
+			if prefetched_key is not None:
+				# prefetch_wad already left the WAD at file_path
+				streamed_hashes = prefetched_hashes
 			else:
-				print(f"📥 Downloading s3://{wad_bucket}/{s3_key}", file=sys.stderr)
-				meta.download_s3_to_path(s3_wads, wad_bucket, s3_key, gz_path)
-				meta.gunzip_file(gz_path, file_path)
-				if redis_client is not None:
-					file_size = os.path.getsize(file_path)
-					if file_size < _MAX_REDIS_CACHE_BYTES:
-						with open(file_path, "rb") as f:
-							buf = f.read()
-						_REDIS_EXECUTOR.submit(_cache_redis_file_sync, redis_client, redis_key, buf)
-
-			computed_hashes = meta.compute_hashes_for_file(file_path)
-			if isinstance(expected_hashes, dict):
-				integrity = meta.validate_expected_hashes(expected_hashes, computed_hashes)
-			else:
-				integrity = None
-
-			extracted = meta.extract_metadata_from_file(file_path, ext)
+				streamed_hashes = _download_wad(s3_wads=s3_wads, bucket=wad_bucket, s3_key=s3_key, sha1=sha1, file_path=file_path)
 
-			# Per-map stats
-			if ext == "wad":
-				with open(file_path, "rb") as f:
-					wad_buf = f.read()
-					per_map_stats = meta.extract_per_map_stats_from_wad_bytes(wad_buf)
-					try:
-						map_titles_by_upper = _extract_map_titles_from_wad_bytes(wad_buf)
-					except Exception:
-						map_titles_by_upper = {}
-			elif ext in {"pk3", "pk7", "pkz", "epk", "pke"}:
-				embedded = meta.find_all_wads_in_zip_path(file_path)
-				map_lists: List[List[Dict[str, Any]]] = []
-				for (_wad_path, wbuf) in embedded:
-					map_lists.append(meta.extract_per_map_stats_from_wad_bytes(wbuf))
-					try:
-						for k, v in _extract_map_titles_from_wad_bytes(wbuf).items():
-							map_titles_by_upper[k] = v
-					except Exception:
-						pass
-				per_map_stats = meta.merge_per_map_stats(map_lists)
-
-			# Ensure we never send duplicate map names to wadinfo. (Even if
-			# meta.merge_per_map_stats() already dedupes for PK3, we defensively
-			# enforce last-occurrence-wins across all formats.)
-			per_map_stats = _dedupe_per_map_stats_keep_last(per_map_stats)
-			_normalize_textures_histograms(per_map_stats)
-			_attach_map_titles(per_map_stats, map_titles_by_upper)
-
-			if render_screens:
-				try:
-					# Deduce IWAD for rendering.
-					wad_type_upper = str(wad_entry.get("type") or "").upper()
-					if wad_type_upper == "IWAD" and ext == "wad":
-						iwad_path = Path(file_path)
-						files_for_render: List[Path] = []
-					else:
-						iwad_path = meta.deduce_iwad_path_from_meta(wad_entry, extracted)
-						files_for_render = [Path(file_path)]
-
-					if upload_screens:
-						os.makedirs(output_path, exist_ok=True)
-						config = RenderConfig(
-							iwad=iwad_path,
-							files=files_for_render,
-							output=Path(output_path),
-							num=screenshot_count,
-							width=screenshot_width,
-							height=screenshot_height,
-							panorama=panorama,
-							invulnerable=True,
-						)
-						render_screenshots(config)
-						meta.upload_screenshots(
+			render_future = None
+			try:
+				# Metadata extraction, hashing and per-map parsing share one
+				# read-only mapping of the file rather than each reading it.
+				with meta.map_file(file_path) as wad_buf:
+					extracted = meta.extract_metadata_from_file(file_path, ext, wad_buf)
+
+					# Rendering only needs the file and the extracted metadata, so it
+					# runs alongside hashing and per-map parsing rather than after.
+					if cfg.render_screens:
+						render_future = _RENDER_EXECUTOR.submit(
+							_render_and_upload_screenshots,
 							sha1=sha1,
-							path=output_path,
-							bucket=images_bucket,
-							endpoint=images_endpoint,
+							wad_entry=wad_entry,
+							wad_info=wad_info,
+							extracted=extracted,
+							ext=ext,
+							file_path=file_path,
+							output_path=output_path,
+							cfg=cfg,
 						)
-				except Exception as ex:
-					meta.eprint(f"⚠️ Screenshot rendering/upload failed for {sha1}: {type(ex).__name__}: {ex}")
+
+					computed_hashes = streamed_hashes or meta.compute_hashes_for_buffer(wad_buf)
+					if ext == "wad":
+						per_map_stats = meta.extract_per_map_stats_from_wad_bytes(wad_buf)
+						try:
+							map_titles_by_upper = _extract_map_titles_from_wad_bytes(wad_buf)
+						except Exception:
+							map_titles_by_upper = {}
+				if wad_info.expected_hashes is not None:
+					integrity = meta.validate_expected_hashes(wad_info.expected_hashes, computed_hashes)
+				else:
+					integrity = None
+
+				# Per-map stats
+				if ext in {"pk3", "pk7", "pkz", "epk", "pke"}:
+					embedded = meta.find_all_wads_in_zip_path(file_path)
+					map_lists = _per_map_stats_for_embedded(embedded)
+					for (_wad_path, wbuf) in embedded:
+						try:
+							for k, v in _extract_map_titles_from_wad_bytes(wbuf).items():
+								map_titles_by_upper[k] = v
+						except Exception:
+							pass
+					per_map_stats = meta.merge_per_map_stats(map_lists)
+
+				# Ensure we never send duplicate map names to wadinfo. (Even if
+				# meta.merge_per_map_stats() already dedupes for PK3, we defensively
+				# enforce last-occurrence-wins across all formats.)
+				per_map_stats = _dedupe_per_map_stats_keep_last(per_map_stats)
+				_normalize_textures_histograms(per_map_stats)
+				_attach_map_titles(per_map_stats, map_titles_by_upper)
+			finally:
+				# The render reads from the temp dir, so it must finish first.
+				if render_future is not None:
+					render_future.result()
 		except Exception as ex:
 			extracted = {
 				"format": "unknown",
@@ -813,7 +1182,7 @@ def analyze_one_wad(
 
 	meta_obj = meta.build_output_object(
 		sha1=sha1,
-		sha256=(computed_hashes or {}).get("sha256") or expected_sha256,
+		sha256=(computed_hashes or {}).get("sha256") or wad_info.expected_sha256,
 		s3_url=s3_url,
 		extracted=extracted,
 		wad_archive=wad_entry,
@@ -826,8 +1195,8 @@ def analyze_one_wad(
 	if isinstance(meta_obj, dict):
 		meta_obj["text_files"] = _dedupe_text_files_by_stripped_contents(meta_obj.get("text_files"))
 	out_obj = {"meta": meta_obj, "maps": per_map_stats}
-	if post_to_wadinfo:
-		meta.post_to_wadinfo(out_obj, sha1, wadinfo_base_url=wadinfo_base_url)
+	if cfg.post_to_wadinfo:
+		meta.post_to_wadinfo(out_obj, sha1, wadinfo_base_url=cfg.wadinfo_base_url)
 	return out_obj
 
 
@@ -835,9 +1204,12 @@ def signal_ready() -> None:
 	ready_file = os.getenv("DORCH_READY_FILE")
 	if ready_file:
 		try:
-			with open(ready_file, "w", encoding="utf-8") as f:
-				f.write(f"ready {time.time()}\n")
-		except Exception as ex:
+			fd = os.open(ready_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+			try:
+				os.write(fd, f"ready {time.time()}\n".encode())
+			finally:
+				os.close(fd)
+		except OSError as ex:
 			meta.eprint(f"⚠️ Could not write ready file {ready_file}: {type(ex).__name__}: {ex}")
 			
 async def _run(args: argparse.Namespace) -> None:
@@ -862,44 +1234,64 @@ async def _run(args: argparse.Namespace) -> None:
 		pass
 
 	# JetStream + S3 clients
-	region_name = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION")
-	wad_bucket = _env_str("DORCH_WAD_BUCKET", "wadarchive2")
-	wad_endpoint = _env_str("DORCH_WAD_ENDPOINT", "https://nyc3.digitaloceanspaces.com")
-	images_bucket = _env_str("DORCH_IMAGES_BUCKET", "wadimages2")
-	images_endpoint = _env_str("DORCH_IMAGES_ENDPOINT", "https://nyc3.digitaloceanspaces.com")
-	print(f'🧪 region_name: {region_name}', file=sys.stderr)
-	print(f'🧪 wad_endpoint: {wad_endpoint}', file=sys.stderr)
-	print(f'🧪 wad_bucket: {wad_bucket}', file=sys.stderr)
-	print(f'🧪 images_endpoint: {images_endpoint}', file=sys.stderr)
-	print(f'🧪 images_bucket: {images_bucket}', file=sys.stderr)
-
-	post_to_wadinfo = _env_bool("DORCH_POST_TO_WADINFO", True)
-	wadinfo_base_url = _env_str("WADINFO_BASE_URL", "http://localhost:8000")
-	print(f'🧪 wadinfo_base_url: {wadinfo_base_url}', file=sys.stderr)
-
-	render_screens = _env_bool("DORCH_RENDER_SCREENSHOTS", False)
-	upload_screens = _env_bool("DORCH_UPLOAD_SCREENSHOTS", False)
-	screenshot_width = _env_int("DORCH_SCREENSHOT_WIDTH", 800)
-	screenshot_height = _env_int("DORCH_SCREENSHOT_HEIGHT", 600)
-	screenshot_count = _env_int("DORCH_SCREENSHOT_COUNT", 5)
-	panorama = _env_bool("DORCH_PANORAMA", False)
-	print(f'🧪 render_screens: {render_screens}', file=sys.stderr)
-	print(f'🧪 upload_screens: {upload_screens}', file=sys.stderr)
-	print(f'🧪 screenshot_width: {screenshot_width}', file=sys.stderr)
-	print(f'🧪 screenshot_height: {screenshot_height}', file=sys.stderr)
-	print(f'🧪 screenshot_count: {screenshot_count}', file=sys.stderr)
-	print(f'🧪 panorama: {panorama}', file=sys.stderr)
+	cfg = WorkerConfig.from_env()
+	for name in WorkerConfig.__slots__:
+		print(f'🧪 {name}: {getattr(cfg, name)}', file=sys.stderr)
+	if not meta.OPENSSL_HASHES:
+		meta.eprint("⚠️ hashlib is not using OpenSSL for md5/sha1/sha256; WAD hashing will be several times slower")
 
 	_maybe_start_prometheus_http_server(worker="meta-worker")
 
+	# Jobs run side by side: up to `concurrency` analysing, plus up to
+	# `downloads` fetching their WADs for the next free slot.
+	concurrency = max(1, _env_int("DORCH_META_CONCURRENCY", 4))
+	downloads = max(1, _env_int("DORCH_PREFETCH", 2))
+
+	# prefetch_wad and analyze_one_wad run via asyncio.to_thread; size the
+	# default executor so every job stage can run at once.
+	asyncio.get_running_loop().set_default_executor(
+		ThreadPoolExecutor(max_workers=max(concurrency + downloads, _env_int("DORCH_META_WORKERS", 4)))
+	)
+
+	# Concurrent downloads each run ranged GETs through this one client, so
+	# its pool has to cover them all.
+	s3_pool = max(_env_int("DORCH_S3_POOL", 32), downloads * meta.S3_RANGE_CONCURRENCY)
 	s3_wads = boto3.client(
 		"s3",
-		endpoint_url=wad_endpoint,
-		region_name=region_name,
+		endpoint_url=cfg.wad_endpoint,
+		region_name=cfg.region_name,
+		config=Config(
+			max_pool_connections=s3_pool,
+			retries={"max_attempts": 5, "mode": "adaptive"},
+			tcp_keepalive=True,
+		),
 	)
-
+	# With aiobotocore installed, WAD downloads run on the event loop rather
+	# than holding a thread each. DORCH_S3_ASYNC=0 keeps them on boto3.
+	aio_stack = contextlib.AsyncExitStack()
+	s3_aio = None
+
+	work_dirs: asyncio.Queue[str] = asyncio.Queue()
+	pooled_dirs: List[str] = []
+	# A single waiter on the shutdown event, shared by every fetch and job
+	# wait rather than a new task per wait.
+	shutdown_task = asyncio.ensure_future(shutdown.wait())
 	nc = await connect_nats()
 	try:
+		if _AIOBOTOCORE_AVAILABLE and _env_bool("DORCH_S3_ASYNC", True):
+			s3_aio = await aio_stack.enter_async_context(
+				_aio_session().create_client(
+					"s3",
+					endpoint_url=cfg.wad_endpoint,
+					region_name=cfg.region_name,
+					config=AioConfig(
+						max_pool_connections=s3_pool,
+						retries={"max_attempts": 5, "mode": "adaptive"},
+						tcp_keepalive=True,
+					),
+				)
+			)
+
 		js = nc.jetstream()
 		await ensure_stream(js, STREAM_NAME, subjects=["dorch.wad.*.meta"])
 
@@ -909,130 +1301,220 @@ async def _run(args: argparse.Namespace) -> None:
 			durable=durable,
 			stream=STREAM_NAME,
 		)
+		# Spawned workers each import meta (boto3 and all) once; do that
+		# before reporting ready rather than inside the first PK3 job.
+		await asyncio.to_thread(_warm_cpu_pool)
 		signal_ready()
 		meta.eprint(f"🚀 Consuming from stream={STREAM_NAME} durable={durable}")
+
+		# One reusable scratch directory per job that is downloading or
+		# analysing, instead of a fresh temp dir for every message.
+		tmp_base = _tmp_base()
+		for _ in range(concurrency + downloads):
+			pooled_dirs.append(tempfile.mkdtemp(prefix="dorch_meta_w", dir=tmp_base))
+			work_dirs.put_nowait(pooled_dirs[-1])
+
+		# Downloads run as their own stage, capped separately from analysis,
+		# so the next jobs' WADs stream in while earlier ones are parsed.
+		download_slots = asyncio.Semaphore(downloads)
+		job_slots = asyncio.Semaphore(concurrency)
+
+		async def _process_one(msg: Any) -> None:
+			if shutdown.is_set():
+				# Best-effort immediate redelivery for any fetched-but-unprocessed messages.
+				try:
+					await msg.nak()
+				except Exception:
+					pass
+				return
+
+			job_start = time.perf_counter()
+			if _PROM_AVAILABLE:
+				_META_IN_PROGRESS.inc()
+			sha1 = None
+			try:
+				job = parse_meta_job(msg.data)
+				sha1 = job.sha1
+				# Subject is considered authoritative if it contains a sha1.
+				sub_sha1 = sha1_from_subject(msg.subject)
+				if sub_sha1 and sub_sha1 != sha1:
+					sha1 = sub_sha1
+				if not _valid_sha1(sha1):
+					raise ValueError(f"invalid sha1: {sha1}")
+
+				prefetched_key: Optional[str] = None
+				prefetched_hashes: Optional[Dict[str, str]] = None
+				async with download_slots:
+					work_dir = await work_dirs.get()
+					if s3_aio is not None:
+						fetch_wad = asyncio.create_task(
+							prefetch_wad_async(
+								sha1=sha1,
+								wad_entry=job.wad_entry,
+								s3_wads=s3_wads,
+								s3_aio=s3_aio,
+								cfg=cfg,
+								work_dir=work_dir,
+								wad_info=job.wad_info,
+							)
+						)
+					else:
+						fetch_wad = asyncio.create_task(
+							asyncio.to_thread(
+								prefetch_wad,
+								sha1=sha1,
+								wad_entry=job.wad_entry,
+								s3_wads=s3_wads,
+								cfg=cfg,
+								work_dir=work_dir,
+								wad_info=job.wad_info,
+							)
+						)
+					done, pending = await asyncio.wait(
+						{fetch_wad, shutdown_task},
+						return_when=asyncio.FIRST_COMPLETED,
+					)
+				if fetch_wad in done:
+					try:
+						prefetched_key, prefetched_hashes = fetch_wad.result()
+					except meta.S3KeyResolutionError:
+						work_dirs.put_nowait(work_dir)
+						raise
+					except Exception as ex:
+						# analyze_one_wad downloads again itself and records
+						# the failure in the output if it happens again.
+						meta.eprint(f"⚠️ Prefetch failed for {sha1}: {type(ex).__name__}: {ex}")
+					async with job_slots:
+						work_task = asyncio.create_task(
+							asyncio.to_thread(
+								analyze_one_wad,
+								sha1=sha1,
+								wad_entry=job.wad_entry,
+								idgames_entry=job.idgames_entry,
+								readmes_entry=job.readmes_entry,
+								filenames_entry=job.filenames_entry,
+								additional_entry=job.additional_entry,
+								s3_wads=s3_wads,
+								cfg=cfg,
+								work_dir=work_dir,
+								prefetched_key=prefetched_key,
+								prefetched_hashes=prefetched_hashes,
+								wad_info=job.wad_info,
+							)
+						)
+						done, pending = await asyncio.wait(
+							{work_task, shutdown_task},
+							return_when=asyncio.FIRST_COMPLETED,
+						)
+				else:
+					work_task = fetch_wad
+				# The thread may outlive a cancelled task, but by then we are
+				# shutting down and no further job will take the directory.
+				work_task.add_done_callback(lambda _t: work_dirs.put_nowait(work_dir))
+
+				if shutdown_task in done:
+					# Shutdown requested mid-job: best-effort NAK so it redelivers quickly.
+					try:
+						await msg.nak()
+					except Exception:
+						pass
+					if _PROM_AVAILABLE:
+						_META_JOBS_TOTAL.labels("aborted").inc()
+					# Cancel the worker task (it may be running in a thread).
+					work_task.cancel()
+					# Avoid noisy "Task exception was never retrieved" warnings.
+					work_task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
+					return
+
+				# Job finished; propagate any exception.
+				await work_task
+				await msg.ack()
+				if _PROM_AVAILABLE:
+					_META_JOBS_TOTAL.labels("success").inc()
+				print(f"✅ Processed metadata for {sha1}", file=sys.stderr)
+			except meta.S3KeyResolutionError:
+				meta.eprint(f"⚠️ Skipping entry because S3 key was not found for {sha1}")
+				if _PROM_AVAILABLE:
+					_META_JOBS_TOTAL.labels("failure").inc()
+					_META_JOBS_TOTAL.labels("S3KeyResolutionError").inc()
+				try:
+					await msg.ack()
+				except Exception:
+					pass
+			except Exception as ex:
+				meta.eprint(f"💥 Failed to process {sha1}: {type(ex).__name__}: {ex}")
+				if _PROM_AVAILABLE:
+					_META_JOBS_TOTAL.labels("failure").inc()
+					_META_EXCEPTIONS_TOTAL.labels(type(ex).__name__).inc()
+					try:
+						# Requeue for retry (JetStream redeliver)
+						await msg.nak()
+					except Exception:
+						pass
+					finally:
+						if _PROM_AVAILABLE:
+							_META_IN_PROGRESS.dec()
+							_META_JOB_DURATION_SECONDS.observe(max(0.0, time.perf_counter() - job_start))
+
+		# Messages are dispatched as they arrive rather than a batch at a
+		# time, up to one per job slot and download slot. --prefetch holds
+		# one more batch on top so a freed slot never waits on a fetch, but
+		# those messages count against the consumer's ack wait while they
+		# sit, so it only suits jobs that finish well inside it. The
+		# consumer's MaxAckPending (1000 unless configured) must exceed this.
+		max_held = concurrency + downloads + (args.batch if args.prefetch else 0)
+		fetch_task: Optional[asyncio.Task] = None
+		in_flight: Set[asyncio.Task] = set()
 		while not shutdown.is_set():
-			fetch_task = asyncio.create_task(sub.fetch(args.batch, timeout=args.fetch_timeout))
-			shutdown_task = asyncio.create_task(shutdown.wait())
+			room = max_held - len(in_flight)
+			if room <= 0:
+				await asyncio.wait(in_flight | {shutdown_task}, return_when=asyncio.FIRST_COMPLETED)
+				continue
+			# One long-polling pull for whatever fits; JetStream hands back a
+			# partial batch as soon as messages arrive, so a large batch and
+			# timeout cost nothing when busy and save empty round trips when idle.
+			fetch_task = asyncio.create_task(sub.fetch(min(args.batch, room), timeout=args.fetch_timeout))
 			done, pending = await asyncio.wait(
 				{fetch_task, shutdown_task},
 				return_when=asyncio.FIRST_COMPLETED,
 			)
 
 			if shutdown_task in done:
-				fetch_task.cancel()
-				with contextlib.suppress(Exception):
-					await fetch_task
 				break
 
-			shutdown_task.cancel()
 			msgs = []
 			try:
 				msgs = await fetch_task
 			except Exception:
 				# fetch timeout is normal; loop
 				continue
+			finally:
+				fetch_task = None
 
+			# Each job acks or naks its own message.
 			for msg in msgs:
-				if shutdown.is_set():
-					# Best-effort immediate redelivery for any fetched-but-unprocessed messages.
-					try:
+				task = asyncio.create_task(_process_one(msg))
+				in_flight.add(task)
+				task.add_done_callback(in_flight.discard)
+
+		# Let jobs already under way finish (or nak on shutdown).
+		await asyncio.gather(*in_flight)
+
+		if fetch_task is not None:
+			fetch_task.cancel()
+			with contextlib.suppress(BaseException):
+				# Hand back a batch that was fetched but never started.
+				for msg in await fetch_task:
+					with contextlib.suppress(Exception):
 						await msg.nak()
-					except Exception:
-						pass
-					continue
-
-				job_start = time.perf_counter()
-				if _PROM_AVAILABLE:
-					_META_IN_PROGRESS.inc()
-				sha1 = None
-				try:
-					job = parse_meta_job(msg.data)
-					sha1 = job.sha1
-					# Subject is considered authoritative if it contains a sha1.
-					sub_sha1 = sha1_from_subject(msg.subject)
-					if sub_sha1 and sub_sha1 != sha1:
-						sha1 = sub_sha1
-					if not _valid_sha1(sha1):
-						raise ValueError(f"invalid sha1: {sha1}")
-
-					work_task = asyncio.create_task(
-						asyncio.to_thread(
-							analyze_one_wad,
-							sha1=sha1,
-							wad_entry=job.wad_entry,
-							idgames_entry=job.idgames_entry,
-							readmes_entry=job.readmes_entry,
-							filenames_entry=job.filenames_entry,
-							additional_entry=job.additional_entry,
-							s3_wads=s3_wads,
-							wad_bucket=wad_bucket,
-							post_to_wadinfo=post_to_wadinfo,
-							wadinfo_base_url=wadinfo_base_url,
-							render_screens=render_screens,
-							upload_screens=upload_screens,
-							screenshot_width=screenshot_width,
-							screenshot_height=screenshot_height,
-							screenshot_count=screenshot_count,
-							panorama=panorama,
-							images_bucket=images_bucket,
-							images_endpoint=images_endpoint,
-						)
-					)
-					shutdown_task = asyncio.create_task(shutdown.wait())
-					done, pending = await asyncio.wait(
-						{work_task, shutdown_task},
-						return_when=asyncio.FIRST_COMPLETED,
-					)
-
-					if shutdown_task in done:
-						# Shutdown requested mid-job: best-effort NAK so it redelivers quickly.
-						try:
-							await msg.nak()
-						except Exception:
-							pass
-						if _PROM_AVAILABLE:
-							_META_JOBS_TOTAL.labels("aborted").inc()
-						# Cancel the worker task (it may be running in a thread).
-						work_task.cancel()
-						# Avoid noisy "Task exception was never retrieved" warnings.
-						work_task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
-						break
-
-					# Job finished; propagate any exception.
-					shutdown_task.cancel()
-					await work_task
-					await msg.ack()
-					if _PROM_AVAILABLE:
-						_META_JOBS_TOTAL.labels("success").inc()
-					print(f"✅ Processed metadata for {sha1}", file=sys.stderr)
-				except meta.S3KeyResolutionError:
-					meta.eprint(f"⚠️ Skipping entry because S3 key was not found for {sha1}")
-					if _PROM_AVAILABLE:
-						_META_JOBS_TOTAL.labels("failure").inc()
-						_META_JOBS_TOTAL.labels("S3KeyResolutionError").inc()
-					try:
-						await msg.ack()
-					except Exception:
-						pass
-				except Exception as ex:
-					meta.eprint(f"💥 Failed to process {sha1}: {type(ex).__name__}: {ex}")
-					if _PROM_AVAILABLE:
-						_META_JOBS_TOTAL.labels("failure").inc()
-						_META_EXCEPTIONS_TOTAL.labels(type(ex).__name__).inc()
-						try:
-							# Requeue for retry (JetStream redeliver)
-							await msg.nak()
-						except Exception:
-							pass
-						finally:
-							if _PROM_AVAILABLE:
-								_META_IN_PROGRESS.dec()
-								_META_JOB_DURATION_SECONDS.observe(max(0.0, time.perf_counter() - job_start))
-
-				if shutdown.is_set():
-					break
 	finally:
+		shutdown_task.cancel()
+		if _CPU_POOL is not None:
+			_CPU_POOL.shutdown(wait=False, cancel_futures=True)
+		with contextlib.suppress(Exception):
+			await aio_stack.aclose()
+		for d in pooled_dirs:
+			shutil.rmtree(d, ignore_errors=True)
 		if fast_exit:
 			try:
 				await nc.flush(timeout=nats_flush_timeout_seconds())
@@ -1046,8 +1528,19 @@ async def _run(args: argparse.Namespace) -> None:
 def main() -> None:
 	ap = argparse.ArgumentParser(description="Consume dorch meta jobs from NATS JetStream")
 	ap.add_argument("--durable", default=os.getenv("DORCH_META_DURABLE", "meta-worker"), help="JetStream durable consumer name")
-	ap.add_argument("--batch", type=int, default=int(os.getenv("DORCH_META_BATCH", "1")), help="Fetch batch size")
-	ap.add_argument("--fetch-timeout", type=float, default=float(os.getenv("DORCH_META_FETCH_TIMEOUT", "1.0")), help="Fetch timeout seconds")
+	ap.add_argument(
+		"--batch",
+		type=int,
+		default=int(os.getenv("DORCH_META_BATCH", "16")),
+		help="Most messages per fetch (also capped by free job slots)",
+	)
+	ap.add_argument(
+		"--prefetch",
+		action="store_true",
+		default=_env_bool("DORCH_META_PREFETCH", False),
+		help="Hold one extra fetched batch beyond the job slots",
+	)
+	ap.add_argument("--fetch-timeout", type=float, default=float(os.getenv("DORCH_META_FETCH_TIMEOUT", "5.0")), help="Fetch timeout seconds")
 	args = ap.parse_args()
 
 	try:
@@ -26,11 +26,15 @@ Notes:
 
 from __future__ import annotations
 import argparse
-import gzip
+import asyncio
+import contextlib
 import hashlib
 import io
+import itertools
 import json
 import mimetypes
+import mmap
+import multiprocessing
 import os
 from pathlib import Path
 import re
@@ -38,15 +42,40 @@ import struct
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+from meta_eda import json_loads
+import numpy as np
 from screenshots import RenderConfig, render_screenshots
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 import requests
 
+try:
+    import rapidgzip  # type: ignore
+
+    _RAPIDGZIP_AVAILABLE = True
+except Exception:  # pragma: no cover
+    # Optional: block-parallel gunzip for large archives.
+    _RAPIDGZIP_AVAILABLE = False
+
+try:
+    from isal import isal_zlib as _inflate  # type: ignore
+
+    _ISAL_AVAILABLE = True
+except Exception:  # pragma: no cover
+    # Optional: ISA-L's inflate and CRC32 are several times faster than
+    # zlib's, with the same decompressobj interface.
+    _inflate = zlib
+    _ISAL_AVAILABLE = False
+
 
 _DEDUPE_README_ALNUM_RE = re.compile(r"[^0-9a-z]+")
 
@@ -732,6 +761,8 @@ def map_summary_from_wad_bytes(buf: bytes, block: Dict[str, Any]) -> Dict[str, A
 
 
 def extract_per_map_stats_from_wad_bytes(buf: bytes) -> List[Dict[str, Any]]:
+    # buf may be any sliceable buffer (e.g. an mmap from map_file); slices
+    # of it are bytes, so lumps are only copied as they are parsed.
     wad_meta = parse_wad_directory_bytes(buf)
     if not wad_meta:
         return []
@@ -776,11 +807,29 @@ def download_url_to_file(url: str, dest_path: str, *, timeout_s: float = 60.0) -
 
 
 def read_json_file(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-        items = [normalize_extended_json_numbers(
-            json.loads(line)) for line in lines if line.strip()]
-        return items
+    # Lines are parsed as bytes straight from the file (orjson when it is
+    # installed and lossless), without holding every line as a str first.
+    with open(path, "rb") as f:
+        return [normalize_extended_json_numbers(json_loads(line))
+                for line in f if line.strip()]
+
+
+def iter_json_file(path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, Any]]:
+    """Stream (index, item) pairs from a JSONL file without loading it whole.
+
+    Indexes match read_json_file (blank lines are skipped); only lines in
+    [start, stop) are parsed.
+    """
+    with open(path, "rb") as f:
+        idx = 0
+        for line in f:
+            if not line.strip():
+                continue
+            if stop is not None and idx >= stop:
+                return
+            if idx >= start:
+                yield idx, normalize_extended_json_numbers(json_loads(line))
+            idx += 1
 
 
 def normalize_extended_json_numbers(obj: Any) -> Any:
@@ -869,8 +918,12 @@ class WadLump:
 
 WAD_HEADER_RE = re.compile(rb"^(IWAD|PWAD)$")
 
+# One 16-byte WAD directory entry.
+_LUMP_DTYPE = np.dtype([("filepos", "<u4"), ("size", "<u4"), ("name", "S8")])
 
-def parse_wad_lumps(buf: bytes) -> Optional[List[WadLump]]:
+
+def _read_wad_directory(buf: bytes) -> Optional[np.ndarray]:
+    """The WAD's lump directory as a _LUMP_DTYPE array (a copy), or None."""
     if len(buf) < 12:
         return None
     ident = buf[0:4]
@@ -884,22 +937,43 @@ def parse_wad_lumps(buf: bytes) -> Optional[List[WadLump]]:
         return None
     if infotableofs < 0 or infotableofs + numlumps * 16 > len(buf):
         return None
+    if numlumps == 0:
+        return np.empty(0, dtype=_LUMP_DTYPE)
+    # Copied so no view of a caller's mmap outlives this call.
+    return np.frombuffer(buf, dtype=_LUMP_DTYPE, count=numlumps, offset=infotableofs).copy()
 
-    lumps: List[WadLump] = []
-    p = infotableofs
-    for _ in range(numlumps):
-        filepos = int.from_bytes(buf[p:p+4], "little", signed=False)
-        size = int.from_bytes(buf[p+4:p+8], "little", signed=False)
-        name = buf[p+8:p+16].rstrip(b"\x00").decode("ascii", errors="replace")
-        p += 16
-        # bounds check
-        if filepos + size > len(buf):
-            # Still return partial listing; extraction will be best-effort.
-            lumps.append(WadLump(name=name, offset=filepos,
-                         size=max(0, len(buf) - filepos)))
-        else:
-            lumps.append(WadLump(name=name, offset=filepos, size=size))
-    return lumps
+
+def _wad_lumps_at(directory: np.ndarray, buf_len: int, idx: Optional[np.ndarray] = None) -> List[WadLump]:
+    """WadLumps for directory[idx] (all entries by default).
+
+    Lumps running past the end of the buffer are cut short, so extraction
+    stays best-effort. numpy's "S8" already drops each name's trailing NULs.
+    """
+    entries = directory if idx is None else directory[idx]
+    offsets = entries["filepos"].astype(np.int64)
+    sizes = np.minimum(entries["size"].astype(np.int64), np.maximum(0, buf_len - offsets))
+    return [
+        WadLump(name=name.decode("ascii", errors="replace"), offset=offset, size=size)
+        for name, offset, size in zip(entries["name"].tolist(), offsets.tolist(), sizes.tolist())
+    ]
+
+
+def parse_wad_lumps(buf: bytes) -> Optional[List[WadLump]]:
+    directory = _read_wad_directory(buf)
+    if directory is None:
+        return None
+    return _wad_lumps_at(directory, len(buf))
+
+
+def _name_code(name: str) -> int:
+    """A lump name as the little-endian u64 of its NUL-padded 8 bytes."""
+    return int.from_bytes(name.encode("ascii").ljust(8, b"\x00"), "little")
+
+
+def _upper_name_bytes(directory: np.ndarray) -> np.ndarray:
+    """Lump names as an (n, 8) uint8 array, ASCII letters upper-cased."""
+    raw = directory.view(np.uint8).reshape(-1, 16)[:, 8:]
+    return raw - ((raw >= 0x61) & (raw <= 0x7A)).astype(np.uint8) * 0x20
 
 
 MAP_MARKER_RE = re.compile(r"^(E[1-9]M[1-9]|MAP[0-9]{2})$")
@@ -941,6 +1015,35 @@ TEXT_LUMP_NAMES = {
     "TEXTURE1",  # not really text, but sometimes contains readable stuff—skip by size heuristic
     "TEXTURE2",
 }
+_TEXT_LUMP_CODES = np.array(sorted(_name_code(n) for n in TEXT_LUMP_NAMES), dtype="<u8")
+_MAP_CORE_LUMP_CODES = frozenset(
+    _name_code(n) for n in ("THINGS", "LINEDEFS", "SIDEDEFS", "VERTEXES", "SECTORS"))
+
+
+def _detect_maps_in_directory(upper: np.ndarray) -> List[str]:
+    """detect_maps_from_lumps over _upper_name_bytes, testing whole columns.
+
+    MAP_MARKER_RE is spelled out as byte comparisons, so only the markers
+    themselves are looked at in Python.
+    """
+    def _digits(col: int, lo: int) -> np.ndarray:
+        return (upper[:, col] >= lo) & (upper[:, col] <= 0x39)
+
+    is_map = (
+        (upper[:, 0] == ord("M")) & (upper[:, 1] == ord("A")) & (upper[:, 2] == ord("P"))
+        & _digits(3, 0x30) & _digits(4, 0x30) & ~upper[:, 5:].any(axis=1)
+    )
+    is_episode = (
+        (upper[:, 0] == ord("E")) & _digits(1, 0x31) & (upper[:, 2] == ord("M"))
+        & _digits(3, 0x31) & ~upper[:, 4:].any(axis=1)
+    )
+    codes = upper.view("<u8").ravel()
+    found: List[str] = []
+    for i in np.flatnonzero(is_map | is_episode).tolist():
+        # Look ahead a small window for core lumps
+        if _MAP_CORE_LUMP_CODES.issubset(codes[i + 1:i + 1 + 16].tolist()):
+            found.append(upper[i].tobytes().rstrip(b"\x00").decode("ascii"))
+    return uniq_preserve(found)
 
 
 def extract_text_lumps(buf: bytes, lumps: List[WadLump], max_each: int = 256_000) -> Dict[str, str]:
@@ -962,6 +1065,13 @@ def extract_text_lumps(buf: bytes, lumps: List[WadLump], max_each: int = 256_000
     return out
 
 
+# Scanned separately rather than as one alternation: a match for one key
+# must not hide a match for another inside its quoted value.
+_LEVELNAME_RE = re.compile(r'\blevelname\s*=\s*"([^"]+)"', re.IGNORECASE)
+_AUTHOR_RE = re.compile(r'\bauthor\s*=\s*"([^"]+)"', re.IGNORECASE)
+_TITLE_RE = re.compile(r'\btitle\s*=\s*"([^"]+)"', re.IGNORECASE)
+
+
 def guess_names_authors_descriptions_from_text(text_blobs: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
     """
     Best-effort. We do not attempt to fully parse all formats; we just capture useful snippets.
@@ -973,12 +1083,9 @@ def guess_names_authors_descriptions_from_text(text_blobs: Dict[str, str]) -> Tu
     for k, t in text_blobs.items():
         # Common: MAPINFO has "levelname" / "author"
         # We'll just regex a few common tokens.
-        for m in re.finditer(r'(?i)\blevelname\s*=\s*"([^"]+)"', t):
-            names.append(m.group(1).strip())
-        for m in re.finditer(r'(?i)\bauthor\s*=\s*"([^"]+)"', t):
-            authors.append(m.group(1).strip())
-        for m in re.finditer(r'(?i)\btitle\s*=\s*"([^"]+)"', t):
-            names.append(m.group(1).strip())
+        names += [v.strip() for v in _LEVELNAME_RE.findall(t)]
+        authors += [v.strip() for v in _AUTHOR_RE.findall(t)]
+        names += [v.strip() for v in _TITLE_RE.findall(t)]
 
         # Intentionally do NOT treat DEHACKED/BEX/etc as player-facing descriptions.
 
@@ -988,21 +1095,25 @@ def guess_names_authors_descriptions_from_text(text_blobs: Dict[str, str]) -> Tu
 
 
 def extract_from_wad_bytes(buf: bytes) -> Dict[str, Any]:
-    lumps = parse_wad_lumps(buf)
-    if not lumps:
+    directory = _read_wad_directory(buf)
+    if directory is None or not len(directory):
         return {
             "format": "unknown",
             "error": "Not a classic IWAD/PWAD header (or too small/corrupt)",
         }
 
-    maps = detect_maps_from_lumps(lumps)
-    text_lumps = extract_text_lumps(buf, lumps)
+    # Names are matched as whole-array comparisons; WadLumps are only built
+    # for the few text lumps, not for every entry in the directory.
+    upper = _upper_name_bytes(directory)
+    maps = _detect_maps_in_directory(upper)
+    text_idx = np.flatnonzero(np.isin(upper.view("<u8").ravel(), _TEXT_LUMP_CODES))
+    text_lumps = extract_text_lumps(buf, _wad_lumps_at(directory, len(buf), text_idx))
     names, authors, descs = guess_names_authors_descriptions_from_text(
         text_lumps)
 
     return {
         "format": "wad",
-        "lump_count": len(lumps),
+        "lump_count": len(directory),
         "maps": maps,
         "text_lumps": list(text_lumps.keys()),
         "names": names or None,
@@ -1333,6 +1444,14 @@ def pick_best_description(candidates: List[Dict[str, Any]]) -> Optional[List[str
 
 
 def extract_from_zip_bytes(buf: bytes, max_text_files: int = 20, max_text_each: int = 200_000) -> Dict[str, Any]:
+    return extract_from_zip_file(io.BytesIO(buf), max_text_files=max_text_files, max_text_each=max_text_each)
+
+
+def extract_from_zip_file(file: Any, max_text_files: int = 20, max_text_each: int = 200_000) -> Dict[str, Any]:
+    """Like extract_from_zip_bytes, for a path or seekable file object.
+
+    zipfile then reads only the central directory and the members it needs.
+    """
     out: Dict[str, Any] = {
         "format": "zip",
         "embedded_wads": [],
@@ -1347,7 +1466,7 @@ def extract_from_zip_bytes(buf: bytes, max_text_files: int = 20, max_text_each:
     descs: List[str] = []
 
     try:
-        with zipfile.ZipFile(io.BytesIO(buf)) as z:
+        with zipfile.ZipFile(file) as z:
             # Look for embedded WADs + small textlike files
             text_collected = 0
             for info in z.infolist():
@@ -1505,6 +1624,41 @@ def find_all_wads_in_zip_path(zip_path: str) -> List[Tuple[str, bytes]]:
     return out
 
 
+# Below this, shipping a WAD to a worker process costs more than parsing it.
+PROCESS_POOL_MIN_BYTES = 1024 * 1024
+
+
+def default_cpu_workers() -> int:
+    return min(8, os.cpu_count() or 1)
+
+
+def new_cpu_pool(max_workers: int) -> ProcessPoolExecutor:
+    # spawn rather than fork: callers may already be running threads.
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def per_map_stats_for_embedded(
+    embedded: List[Tuple[str, bytes]], pool: Optional[Executor] = None
+) -> List[List[Dict[str, Any]]]:
+    """extract_per_map_stats_from_wad_bytes for each (path, wad_bytes), in order.
+
+    Given a process pool, WADs of PROCESS_POOL_MIN_BYTES or more are parsed
+    there so several run at once despite the GIL; a lone WAD stays in-process.
+    """
+    if len(embedded) < 2:
+        pool = None
+    results: List[Any] = []
+    for (_wad_path, wbuf) in embedded:
+        if pool is not None and len(wbuf) >= PROCESS_POOL_MIN_BYTES:
+            results.append(pool.submit(extract_per_map_stats_from_wad_bytes, wbuf))
+        else:
+            results.append(extract_per_map_stats_from_wad_bytes(wbuf))
+    return [r.result() if isinstance(r, Future) else r for r in results]
+
+
 def merge_per_map_stats(map_lists_in_load_order: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """Merge per-map stats with 'last loaded wins' semantics.
 
@@ -1640,21 +1794,315 @@ def resolve_s3_key(
 
 
 
-def download_s3_to_path(s3, bucket: str, key: str, out_path: str) -> None:
-    """Download s3://bucket/key → out_path (atomic replace)."""
+def gunzip_chunks(chunks: Iterable[bytes], out) -> None:
+    """Decompress a gzip stream given as chunks of bytes into the file out.
+
+    Like gzip.open, this handles concatenated members and raises EOFError
+    if the stream is truncated.
+    """
+    gz = _GunzipWriter(out)
+    for chunk in chunks:
+        gz.write(chunk)
+    gz.close()
+
+
+class _GunzipWriter:
+    """gunzip_chunks one chunk at a time: write() each, then close()."""
+
+    def __init__(self, out) -> None:
+        self._out = out
+        self._d: Optional[Any] = _inflate.decompressobj(31)
+        self._fed = False
+
+    def write(self, chunk: bytes) -> None:
+        while chunk:
+            if self._d is None:
+                # Between members; like gzip.open, skip any zero padding.
+                chunk = chunk.lstrip(b"\x00")
+                if not chunk:
+                    return
+                self._d = _inflate.decompressobj(31)
+            self._fed = True
+            self._out.write(self._d.decompress(chunk))
+            if not self._d.eof:
+                break
+            # End of one member; the rest may be padding or the next member.
+            chunk = self._d.unused_data
+            self._d = None
+            self._fed = False
+
+    def close(self) -> None:
+        if self._d is not None and self._fed:
+            self._out.write(self._d.flush())
+            if not self._d.eof:
+                raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+
+# Objects larger than one chunk are fetched as this many concurrent ranged
+# GETs; a single connection tops out well below the link speed.
+S3_RANGE_CHUNK_BYTES = int(os.getenv("DORCH_S3_CHUNK_SIZE") or 8 * 1024 * 1024)
+S3_RANGE_CONCURRENCY = int(os.getenv("DORCH_S3_CONCURRENCY") or 8)
+
+
+def _s3_object_chunks(s3, bucket: str, key: str) -> Tuple[int, Iterator[bytes]]:
+    """Return (object size, iterator over its bytes in order).
+
+    The first request asks for only the first chunk; its Content-Range gives
+    the total size. Past that, the remaining ranges are fetched by a pool of
+    S3_RANGE_CONCURRENCY threads, at most that many ahead of the consumer,
+    and pinned to the first response's ETag so a concurrent overwrite can't
+    be stitched together from two versions.
+    """
+    chunk = max(1, S3_RANGE_CHUNK_BYTES)
+    resp = None
+    if S3_RANGE_CONCURRENCY > 1:
+        try:
+            resp = s3.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{chunk - 1}")
+        except ClientError as ex:
+            # Empty objects have no satisfiable range.
+            if ex.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+    if resp is None:
+        resp = s3.get_object(Bucket=bucket, Key=key)
+        body = resp["Body"]
+        return int(resp.get("ContentLength") or 0), iter(lambda: body.read(1024 * 1024), b"")
+
+    body = resp["Body"]
+    content_range = str(resp.get("ContentRange") or "")
+    first = iter(lambda: body.read(1024 * 1024), b"")
+    if "/" not in content_range:
+        # Range ignored: this is the whole object.
+        return int(resp.get("ContentLength") or 0), first
+    total = int(content_range.rsplit("/", 1)[1])
+    if total <= chunk:
+        return total, first
+    etag = resp.get("ETag")
+
+    def _fetch(start: int) -> bytes:
+        end = min(start + chunk, total) - 1
+        kwargs: Dict[str, Any] = {"Bucket": bucket, "Key": key, "Range": f"bytes={start}-{end}"}
+        if etag:
+            kwargs["IfMatch"] = etag
+        data = s3.get_object(**kwargs)["Body"].read()
+        if len(data) != end - start + 1:
+            raise IOError(f"short read for s3://{bucket}/{key} bytes={start}-{end}: got {len(data)}")
+        return data
+
+    def _chunks() -> Iterator[bytes]:
+        starts = iter(range(chunk, total, chunk))
+        pool = ThreadPoolExecutor(max_workers=S3_RANGE_CONCURRENCY, thread_name_prefix="s3range")
+        try:
+            pending = deque(pool.submit(_fetch, st) for st in itertools.islice(starts, S3_RANGE_CONCURRENCY))
+            # The first range streams while the rest are in flight.
+            yield from first
+            while pending:
+                data = pending.popleft().result()
+                nxt = next(starts, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_fetch, nxt))
+                yield data
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    return total, _chunks()
+
+
+async def _aiter_body(body, size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    try:
+        while True:
+            piece = await body.read(size)
+            if not piece:
+                return
+            yield piece
+    finally:
+        body.close()
+
+
+async def _s3_object_chunks_async(s3, bucket: str, key: str) -> Tuple[int, AsyncIterator[bytes]]:
+    """_s3_object_chunks for an aiobotocore client, with the GETs as tasks."""
+    chunk = max(1, S3_RANGE_CHUNK_BYTES)
+    resp = None
+    if S3_RANGE_CONCURRENCY > 1:
+        try:
+            resp = await s3.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{chunk - 1}")
+        except ClientError as ex:
+            # Empty objects have no satisfiable range.
+            if ex.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+    if resp is None:
+        resp = await s3.get_object(Bucket=bucket, Key=key)
+        return int(resp.get("ContentLength") or 0), _aiter_body(resp["Body"])
+
+    content_range = str(resp.get("ContentRange") or "")
+    first = _aiter_body(resp["Body"])
+    if "/" not in content_range:
+        # Range ignored: this is the whole object.
+        return int(resp.get("ContentLength") or 0), first
+    total = int(content_range.rsplit("/", 1)[1])
+    if total <= chunk:
+        return total, first
+    etag = resp.get("ETag")
+
+    async def _fetch(start: int) -> bytes:
+        end = min(start + chunk, total) - 1
+        kwargs: Dict[str, Any] = {"Bucket": bucket, "Key": key, "Range": f"bytes={start}-{end}"}
+        if etag:
+            kwargs["IfMatch"] = etag
+        body = (await s3.get_object(**kwargs))["Body"]
+        try:
+            data = await body.read()
+        finally:
+            body.close()
+        if len(data) != end - start + 1:
+            raise IOError(f"short read for s3://{bucket}/{key} bytes={start}-{end}: got {len(data)}")
+        return data
+
+    async def _chunks() -> AsyncIterator[bytes]:
+        starts = iter(range(chunk, total, chunk))
+        pending = deque(asyncio.ensure_future(_fetch(st)) for st in itertools.islice(starts, S3_RANGE_CONCURRENCY))
+        try:
+            # The first range streams while the rest are in flight.
+            async with contextlib.aclosing(first):
+                async for piece in first:
+                    yield piece
+            while pending:
+                data = await pending.popleft()
+                nxt = next(starts, None)
+                if nxt is not None:
+                    pending.append(asyncio.ensure_future(_fetch(nxt)))
+                yield data
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return total, _chunks()
+
+
+# Compressed chunks received ahead of decompression in the async path.
+_GUNZIP_QUEUE_CHUNKS = 4
+
+
+async def download_s3_gunzipped_to_path_async(
+    s3,
+    bucket: str,
+    key: str,
+    out_path: str,
+    *,
+    keep_compressed_below: int = 0,
+    hashes: Optional[Dict[str, str]] = None,
+) -> Optional[bytes]:
+    """download_s3_gunzipped_to_path for an aiobotocore client.
+
+    The GETs run on the event loop; only decompressing and writing each
+    chunk is handed to a thread. A reader task keeps receiving up to
+    _GUNZIP_QUEUE_CHUNKS ahead of that, so the network never waits on zlib.
+    """
+    parent = os.path.dirname(out_path) or "."
+    os.makedirs(parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(out_path) + ".", dir=parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            out = _HashingWriter(f) if hashes is not None else f
+            start = time.perf_counter()
+            print(f"Downloading file • key={key}", file=sys.stderr)
+            size, chunks = await _s3_object_chunks_async(s3, bucket, key)
+            kept: Optional[List[bytes]] = [] if 0 < size < keep_compressed_below else None
+            gz = _GunzipWriter(out)
+            # Bounded by slots rather than maxsize, so the end marker can
+            # always be queued without waiting.
+            slots = asyncio.Semaphore(_GUNZIP_QUEUE_CHUNKS)
+            queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+
+            async def _receive() -> None:
+                try:
+                    # aclosing: an early exit still cancels the ranges in flight.
+                    async with contextlib.aclosing(chunks):
+                        async for piece in chunks:
+                            await slots.acquire()
+                            queue.put_nowait(piece)
+                finally:
+                    queue.put_nowait(None)
+
+            reader = asyncio.ensure_future(_receive())
+            try:
+                while (chunk := await queue.get()) is not None:
+                    slots.release()
+                    if kept is not None:
+                        kept.append(chunk)
+                    await asyncio.to_thread(gz.write, chunk)
+                await reader  # re-raises a failed receive
+            finally:
+                reader.cancel()
+                reader.add_done_callback(lambda t: t.cancelled() or t.exception())
+            gz.close()
+            if hashes is not None:
+                hashes.update(out.hexdigests())
+        elapsed_ms = int((time.perf_counter() - start) * 1000.0)
+        rate = size / 1048576 / max(elapsed_ms / 1000.0, 0.001)
+        print(f"Download complete • size={(size / 1048576):.2f} MiB • elapsed={elapsed_ms} ms • avg_rate={rate:.1f} MiB/s", file=sys.stderr)
+        os.replace(tmp_path, out_path)
+        return b"".join(kept) if kept is not None else None
+    except BaseException:
+        # BaseException too: a cancelled download must not leave its temp file.
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def download_s3_gunzipped_to_path(
+    s3,
+    bucket: str,
+    key: str,
+    out_path: str,
+    *,
+    keep_compressed_below: int = 0,
+    hashes: Optional[Dict[str, str]] = None,
+) -> Optional[bytes]:
+    """Stream gzipped s3://bucket/key straight into out_path, decompressed.
+
+    The .gz never touches disk and decompression overlaps the transfer. If the object is smaller than
+    keep_compressed_below bytes, the compressed bytes are returned as well
+    (e.g. for caching); otherwise None. If hashes is given, it is filled in
+    like compute_hashes_for_file, hashing the data as it is written rather
+    than reading the file back.
+    """
     parent = os.path.dirname(out_path) or "."
     os.makedirs(parent, exist_ok=True)
-    #print(f"Downloading s3://{bucket}/{key} to {out_path}...", file=sys.stderr)
     fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(out_path) + ".", dir=parent)
     try:
-        os.close(fd)
         start = time.perf_counter()
         print(f"Downloading file • key={key}", file=sys.stderr)
-        s3.download_file(bucket, key, tmp_path)
+        size, chunks = _s3_object_chunks(s3, bucket, key)
+        kept: Optional[List[bytes]] = [] if 0 < size < keep_compressed_below else None
+
+        def _chunks() -> Iterator[bytes]:
+            for chunk in chunks:
+                if kept is not None:
+                    kept.append(chunk)
+                yield chunk
+
+        with os.fdopen(fd, "wb") as f:
+            out = _HashingWriter(f) if hashes is not None else f
+            if _RAPIDGZIP_AVAILABLE and size >= RAPIDGZIP_MIN_BYTES:
+                # rapidgzip needs a seekable source, so spool the .gz to an
+                # unlinked temp file and decode it on all cores; that beats
+                # streaming through single-threaded zlib for big archives.
+                with tempfile.TemporaryFile(dir=parent) as gz:
+                    for chunk in _chunks():
+                        gz.write(chunk)
+                    gz.seek(0)
+                    _rapidgunzip(gz, out)
+            else:
+                gunzip_chunks(_chunks(), out)
+        if hashes is not None:
+            hashes.update(out.hexdigests())
         elapsed_ms = int((time.perf_counter() - start) * 1000.0)
-        rate = os.path.getsize(tmp_path) / 1048576 / max(elapsed_ms / 1000.0, 0.001)
-        print(f"Download complete • size={(os.path.getsize(tmp_path) / 1048576):.2f} MiB • elapsed={elapsed_ms} ms • avg_rate={rate:.1f} MiB/s", file=sys.stderr)
+        rate = size / 1048576 / max(elapsed_ms / 1000.0, 0.001)
+        print(f"Download complete • size={(size / 1048576):.2f} MiB • elapsed={elapsed_ms} ms • avg_rate={rate:.1f} MiB/s", file=sys.stderr)
         os.replace(tmp_path, out_path)
+        return b"".join(kept) if kept is not None else None
     except Exception:
         try:
             os.unlink(tmp_path)
@@ -1663,10 +2111,13 @@ def download_s3_to_path(s3, bucket: str, key: str, out_path: str) -> None:
         raise
 
 
-def gunzip_file(src_gz: str, dst_path: str) -> None:
-    with gzip.open(src_gz, "rb") as gz:
-        with open(dst_path, "wb") as out:
-            shutil_copyfileobj(gz, out)
+# Below this, rapidgzip's thread start-up outweighs parallel decoding.
+RAPIDGZIP_MIN_BYTES = 64 * 1024 * 1024
+
+
+def _rapidgunzip(src, out) -> None:
+    with rapidgzip.open(src, parallelization=os.cpu_count() or 1) as gz:
+        shutil_copyfileobj(gz, out)
 
 
 def shutil_copyfileobj(src, dst, length: int = 1024 * 1024) -> None:
@@ -2053,25 +2504,79 @@ def build_output_object(
     return pruned
 
 
-def compute_hashes_for_file(path: str) -> Dict[str, str]:
-    md5 = hashlib.md5()
-    sha1 = hashlib.sha1()
-    sha256 = hashlib.sha256()
+@contextlib.contextmanager
+def map_file(path: str) -> Iterator[Any]:
+    """Yield a read-only mmap of path (b"" for an empty file, which mmap rejects).
 
+    Slicing the mapping yields bytes, so the WAD parsers take it as-is.
+    """
     with open(path, "rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            md5.update(chunk)
-            sha1.update(chunk)
-            sha256.update(chunk)
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
 
-    return {
-        "md5": md5.hexdigest(),
-        "sha1": sha1.hexdigest(),
-        "sha256": sha256.hexdigest(),
-    }
+
+def compute_hashes_for_file(path: str) -> Dict[str, str]:
+    # Map the file and hand each digest the whole thing in one call, rather
+    # than copying 1MB chunks through Python; OpenSSL then runs its
+    # SHA-NI/ARMv8 paths over the file without the GIL.
+    with map_file(path) as buf:
+        return compute_hashes_for_buffer(buf)
+
+
+# Below this, thread handoff costs more than hashing serially.
+_PARALLEL_HASH_MIN_BYTES = 1024 * 1024
+
+# Whether hashlib resolves our digests to OpenSSL (SHA-NI/ARMv8 code paths,
+# GIL released) rather than CPython's builtin fallbacks. Constructing each
+# once here also loads the OpenSSL providers before the first job.
+try:
+    import _hashlib  # type: ignore
+
+    OPENSSL_HASHES = all(isinstance(hashlib.new(a), _hashlib.HASH) for a in ("md5", "sha1", "sha256"))
+except Exception:  # pragma: no cover
+    OPENSSL_HASHES = False
+_HASH_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="hash")
+
+
+def compute_hashes_for_buffer(buf: Any) -> Dict[str, str]:
+    """Like compute_hashes_for_file, for an in-memory or mmap'd buffer.
+
+    Each digest takes the whole buffer in one update(), which hashlib runs
+    without the GIL, so on large buffers the three run on separate threads
+    and wall time is roughly that of sha256 alone.
+    """
+    algos = ("md5", "sha1", "sha256")
+    if len(buf) < _PARALLEL_HASH_MIN_BYTES:
+        return {a: hashlib.new(a, buf).hexdigest() for a in algos}
+    futures = {a: _HASH_EXECUTOR.submit(hashlib.new, a, buf) for a in algos}
+    return {a: f.result().hexdigest() for a, f in futures.items()}
+
+
+class _HashingWriter:
+    """Write through to out, hashing the data on the way past.
+
+    Same digests as compute_hashes_for_buffer, without a second pass over
+    the file; large writes update the three in parallel the same way.
+    """
+
+    def __init__(self, out) -> None:
+        self._out = out
+        self._hashers = {a: hashlib.new(a) for a in ("md5", "sha1", "sha256")}
+
+    def write(self, data: bytes) -> int:
+        if len(data) < _PARALLEL_HASH_MIN_BYTES:
+            for h in self._hashers.values():
+                h.update(data)
+        else:
+            for f in [_HASH_EXECUTOR.submit(h.update, data) for h in self._hashers.values()]:
+                f.result()
+        return self._out.write(data)
+
+    def hexdigests(self) -> Dict[str, str]:
+        return {a: h.hexdigest() for a, h in self._hashers.items()}
 
 
 def validate_expected_hashes(expected: Dict[str, Any], computed: Dict[str, str]) -> Dict[str, Any]:
@@ -2140,15 +2645,16 @@ def build_idgames_lookup(
     """
     lookup: Dict[str, Dict[str, Any]] = {}
     for entry in idgames_entries:
-        hashes = entry.get("hashes") or []
-        if not isinstance(hashes, list) or not hashes:
-            continue
-        linked = [h.lower() for h in hashes if isinstance(
-            h, str) and h.lower() in wad_sha1s]
-        if not linked:
+        hashes = entry.get("hashes")
+        if not hashes or not isinstance(hashes, list):
             continue
-        for h in linked:
-            lookup.setdefault(h, entry)
+        # One pass per entry, lower-casing each hash once.
+        for h in hashes:
+            if not isinstance(h, str):
+                continue
+            h = h.lower()
+            if h in wad_sha1s and h not in lookup:
+                lookup[h] = entry
     return lookup
 
 
@@ -2162,12 +2668,16 @@ def post_to_wadinfo(obj, sha1, wadinfo_base_url: str = WADINFO_BASE_URL) -> None
     response.raise_for_status()
 
 
-def extract_metadata_from_file(path: str, ext: str) -> Dict[str, Any]:
+def extract_metadata_from_file(path: str, ext: str, buf: Optional[Any] = None) -> Dict[str, Any]:
     """
     ext is the *decompressed* file extension (wad/pk3/etc).
+
+    buf may be the file's contents already in memory or mapped (see
+    map_file), so callers that go on to parse the file don't read it twice.
     """
-    with open(path, "rb") as f:
-        buf = f.read()
+    if buf is None:
+        with map_file(path) as mapped:
+            return extract_metadata_from_file(path, ext, mapped)
 
     # WAD
     wad_meta = extract_from_wad_bytes(buf)
@@ -2176,7 +2686,9 @@ def extract_metadata_from_file(path: str, ext: str) -> Dict[str, Any]:
 
     # PK3 etc (zip containers)
     if ext in {"pk3", "pk7", "pkz", "epk", "pke"}:
-        return extract_from_zip_bytes(buf)
+        # mmap isn't a file object zipfile accepts, and wrapping it in
+        # BytesIO would copy the whole archive; read members from disk.
+        return extract_from_zip_file(path)
 
     # Unknown / other
     return {
@@ -2186,6 +2698,9 @@ def extract_metadata_from_file(path: str, ext: str) -> Dict[str, Any]:
     }
 
 
+_SHA1_RE = re.compile(r"[0-9a-f]{40}")
+
+
 def upload_screenshots(sha1: str, path: str, bucket: str, region: Optional[str] = None, endpoint: Optional[str] = None) -> None:
     # TODO: Upload {path}/ to s3://{bucket}/{sha1}/ preserving directory structure.
     # Overwrite existing files.
@@ -2253,7 +2768,9 @@ def main() -> None:
     ap.add_argument("--stream", action="store_true",
                     help="Emit newline-delimited JSON objects (NDJSON)")
     ap.add_argument("--sleep", type=float, default=0.0,
-                    help="Sleep seconds between items (politeness)")
+                    help="Sleep seconds between items, per worker (politeness)")
+    ap.add_argument("--workers", type=int, default=4,
+                    help="Number of WADs to process concurrently")
     ap.add_argument("--post-to-wadinfo", action="store_true",
                     help="POST results to wadinfo service")
     ap.add_argument("--wadinfo-base-url", default=WADINFO_BASE_URL,
@@ -2300,16 +2817,33 @@ def main() -> None:
         raise SystemExit(
             "idgames.json must be a JSON array of idGames entries")
 
-    wad_sha1s = {str(w.get("_id", "")).lower()
-                 for w in wads_data if isinstance(w, dict) and w.get("_id")}
+    # One pass lower-cases and validates every _id; the main loop reads the
+    # result by index instead of redoing it. Entries are left untouched
+    # since they are echoed back in the output.
+    sha1_by_idx: List[Optional[str]] = []
+    wad_sha1s: set[str] = set()
+    for w in wads_data:
+        sha1 = str(w.get("_id") or "").lower() if isinstance(w, dict) else ""
+        if _SHA1_RE.fullmatch(sha1):
+            sha1_by_idx.append(sha1)
+            wad_sha1s.add(sha1)
+        else:
+            sha1_by_idx.append(None)
     id_lookup = build_idgames_lookup(idgames_data, wad_sha1s)
 
-    # S3 client for WAD downloads.
+    # S3 client for WAD downloads, shared by every worker thread (boto3
+    # clients are thread-safe); its pool covers each worker's ranged GETs.
+    workers = max(1, args.workers)
     region_name = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION")
     s3_wads = boto3.client(
         "s3",
         endpoint_url=args.wad_endpoint,
         region_name=region_name,
+        config=BotoConfig(
+            max_pool_connections=max(10, workers * S3_RANGE_CONCURRENCY),
+            retries={"max_attempts": 5, "mode": "adaptive"},
+            tcp_keepalive=True,
+        ),
     )
 
     total = len(wads_data)
@@ -2319,17 +2853,24 @@ def main() -> None:
     out_items: Optional[List[Dict[str, Any]]] = [] if (
         args.pretty and not args.stream) else None
     first_array_item = True
+    # Created on the first PK3 with several embedded WADs, then reused.
+    cpu_pool: Optional[ProcessPoolExecutor] = None
+    cpu_pool_lock = threading.Lock()
     if not args.stream and out_items is None:
         sys.stdout.write("[")
 
-    for idx in range(start, end):
-        wad_entry = wads_data[idx]
-        if not isinstance(wad_entry, dict):
-            continue
+    def process_one(idx: int) -> Optional[Dict[str, Any]]:
+        """Resolve, download, extract and build the output object for one entry.
 
-        sha1 = str(wad_entry.get("_id") or "").lower()
-        if not sha1 or not re.fullmatch(r"[0-9a-f]{40}", sha1):
-            continue
+        Runs on a worker thread; returns None for skipped entries.
+        """
+        nonlocal cpu_pool
+        sha1 = sha1_by_idx[idx]
+        if sha1 is None:
+            return None
+        if args.smoke_test_id is not None and args.smoke_test_id not in sha1:
+            return None
+        wad_entry = wads_data[idx]
 
         expected_hashes = wad_entry.get("hashes") or {}
         expected_sha256 = None
@@ -2337,10 +2878,6 @@ def main() -> None:
             v = expected_hashes.get("sha256")
             if isinstance(v, str) and v.strip():
                 expected_sha256 = v.strip().lower()
-        if not re.fullmatch(r"[0-9a-f]{40}", sha1):
-            raise ValueError("SHA1 must be 40 hex chars")
-        if args.smoke_test_id is not None and args.smoke_test_id not in sha1:
-            continue
         wad_type = str(wad_entry.get("type") or "UNKNOWN")
         ext = TYPE_TO_EXT.get(wad_type, None) or "wad"  # default best-guess
 
@@ -2366,63 +2903,45 @@ def main() -> None:
                 idgames=id_lookup.get(sha1),
                 integrity=None,
             )
-
-            out_obj = {"meta": meta_obj, "maps": per_map_stats}
-
-            if args.stream:
-                sys.stdout.write(json.dumps(
-                    out_obj, indent=2 if args.pretty else None, ensure_ascii=False))
-                sys.stdout.write("\n")
-            else:
-                if out_items is not None:
-                    out_items.append(out_obj)
-                else:
-                    if not first_array_item:
-                        sys.stdout.write(",")
-                    sys.stdout.write("\n" if not first_array_item else "\n")
-                    sys.stdout.write(json.dumps(out_obj, ensure_ascii=False))
-                    first_array_item = False
-
             if args.sleep > 0:
                 time.sleep(args.sleep)
-            continue
+            return {"meta": meta_obj, "maps": per_map_stats}
 
         with tempfile.TemporaryDirectory(prefix="wadmerge_") as td:
-            gz_path = os.path.join(td, f"{sha1}.{ext}.gz")
             file_path = os.path.join(td, f"{sha1}.{ext}")
             output_path = os.path.join(td, f"output_screenshots")
 
             try:
-                download_s3_to_path(s3_wads, args.wad_bucket, s3_key, gz_path)
-
-                # Decompress to actual file
-                with gzip.open(gz_path, "rb") as gz:
-                    with open(file_path, "wb") as out_f:
-                        shutil_copyfileobj(gz, out_f)
-
-                computed_hashes = compute_hashes_for_file(file_path)
-                if isinstance(expected_hashes, dict):
-                    integrity = validate_expected_hashes(
-                        expected_hashes, computed_hashes)
-                else:
-                    integrity = None
-
-                extracted = extract_metadata_from_file(file_path, ext)
-
-                # Per-map stats:
-                # - For WADs, run directly
-                # - For PK3-like zips, analyze all embedded WADs in load order and merge maps
-                if ext == "wad":
-                    with open(file_path, "rb") as f:
-                        per_map_stats = extract_per_map_stats_from_wad_bytes(
-                            f.read())
-                elif ext in {"pk3", "pk7", "pkz", "epk", "pke"}:
-                    embedded = find_all_wads_in_zip_path(file_path)
-                    map_lists: List[List[Dict[str, Any]]] = []
-                    for (_wad_path, wbuf) in embedded:
-                        map_lists.append(
-                            extract_per_map_stats_from_wad_bytes(wbuf))
-                    per_map_stats = merge_per_map_stats(map_lists)
+                # Decompress to the actual file while downloading, hashing
+                # it on the way.
+                computed_hashes = {}
+                download_s3_gunzipped_to_path(
+                    s3_wads, args.wad_bucket, s3_key, file_path, hashes=computed_hashes)
+
+                # One read-only mapping serves metadata and per-map stats;
+                # the page cache is the buffer, with no full read.
+                with map_file(file_path) as wad_buf:
+                    if isinstance(expected_hashes, dict):
+                        integrity = validate_expected_hashes(
+                            expected_hashes, computed_hashes)
+                    else:
+                        integrity = None
+
+                    extracted = extract_metadata_from_file(file_path, ext, wad_buf)
+
+                    # Per-map stats:
+                    # - For WADs, run directly
+                    # - For PK3-like zips, analyze all embedded WADs in load order and merge maps
+                    if ext == "wad":
+                        per_map_stats = extract_per_map_stats_from_wad_bytes(wad_buf)
+                    elif ext in {"pk3", "pk7", "pkz", "epk", "pke"}:
+                        embedded = find_all_wads_in_zip_path(file_path)
+                        if len(embedded) > 1:
+                            with cpu_pool_lock:
+                                if cpu_pool is None:
+                                    cpu_pool = new_cpu_pool(default_cpu_workers())
+                        per_map_stats = merge_per_map_stats(
+                            per_map_stats_for_embedded(embedded, cpu_pool))
 
                 # Deduce IWAD for rendering screenshots.
                 # - If this entry is itself an IWAD, render it directly.
@@ -2511,20 +3030,6 @@ def main() -> None:
 
             out_obj = {"meta": meta_obj, "maps": per_map_stats}
 
-            if args.stream:
-                sys.stdout.write(json.dumps(
-                    out_obj, indent=2 if args.pretty else None, ensure_ascii=False))
-                sys.stdout.write("\n")
-            else:
-                if out_items is not None:
-                    out_items.append(out_obj)
-                else:
-                    if not first_array_item:
-                        sys.stdout.write(",")
-                    sys.stdout.write("\n" if not first_array_item else "\n")
-                    sys.stdout.write(json.dumps(out_obj, ensure_ascii=False))
-                    first_array_item = False
-
             if args.post_to_wadinfo:
                 post_to_wadinfo(
                     out_obj, sha1, wadinfo_base_url=args.wadinfo_base_url)
@@ -2533,6 +3038,45 @@ def main() -> None:
 
         if args.sleep > 0:
             time.sleep(args.sleep)
+        return out_obj
+
+    def emit(out_obj: Dict[str, Any]) -> None:
+        nonlocal first_array_item
+        if args.stream:
+            sys.stdout.write(json.dumps(
+                out_obj, indent=2 if args.pretty else None, ensure_ascii=False))
+            sys.stdout.write("\n")
+        else:
+            if out_items is not None:
+                out_items.append(out_obj)
+            else:
+                if not first_array_item:
+                    sys.stdout.write(",")
+                sys.stdout.write("\n" if not first_array_item else "\n")
+                sys.stdout.write(json.dumps(out_obj, ensure_ascii=False))
+                first_array_item = False
+
+    # Entries are processed by a pool of threads, since each spends most of
+    # its time waiting on S3. At most 2x workers are in flight, and results
+    # are written from this thread in input order as each one is done.
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meta") as ex:
+        window: deque[Future] = deque()
+        try:
+            for idx in range(start, end):
+                window.append(ex.submit(process_one, idx))
+                if len(window) >= workers * 2:
+                    out_obj = window.popleft().result()
+                    if out_obj is not None:
+                        emit(out_obj)
+            while window:
+                out_obj = window.popleft().result()
+                if out_obj is not None:
+                    emit(out_obj)
+        finally:
+            for f in window:
+                f.cancel()
+            if cpu_pool is not None:
+                cpu_pool.shutdown(wait=False, cancel_futures=True)
     #if not args.stream:
     #    if out_items is not None:
     #        sys.stdout.write(json.dumps(
@@ -4,10 +4,18 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+try:
+	import orjson  # type: ignore
+
+	_ORJSON_AVAILABLE = True
+except Exception:  # pragma: no cover
+	_ORJSON_AVAILABLE = False
+
 STREAM_NAME = os.getenv("DORCH_META_STREAM", "DORCH_META")
 SUBJECT_PREFIX = os.getenv("DORCH_META_SUBJECT_PREFIX", "dorch.wad")
 SUBJECT_SUFFIX = os.getenv("DORCH_META_SUBJECT_SUFFIX", "meta")
@@ -32,6 +40,34 @@ def sha1_from_subject(subject: str) -> Optional[str]:
 	return sha1
 
 
+@dataclass(frozen=True)
+class WadEntryInfo:
+	"""The wad_entry fields a worker consults per job, normalized once."""
+
+	wad_type: str
+	wad_type_upper: str
+	expected_hashes: Optional[Dict[str, Any]]  # None when "hashes" is not an object
+	expected_sha256: Optional[str]
+
+
+def wad_entry_info(wad_entry: Dict[str, Any]) -> WadEntryInfo:
+	wad_type = str(wad_entry.get("type") or "UNKNOWN")
+	expected_hashes = wad_entry.get("hashes") or {}
+	expected_sha256 = None
+	if isinstance(expected_hashes, dict):
+		v = expected_hashes.get("sha256")
+		if isinstance(v, str) and v.strip():
+			expected_sha256 = v.strip().lower()
+	else:
+		expected_hashes = None
+	return WadEntryInfo(
+		wad_type=wad_type,
+		wad_type_upper=wad_type.upper(),
+		expected_hashes=expected_hashes,
+		expected_sha256=expected_sha256,
+	)
+
+
 @dataclass(frozen=True)
 class MetaJob:
 	version: int
@@ -42,6 +78,10 @@ class MetaJob:
 	filenames_entry: Optional[Dict[str, Any]]
 	additional_entry: Optional[Dict[str, Any]]
 	dispatched_at: float
+	wad_info: WadEntryInfo = field(init=False, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		object.__setattr__(self, "wad_info", wad_entry_info(self.wad_entry))
 
 	def to_bytes(self) -> bytes:
 		obj: Dict[str, Any] = {
@@ -54,11 +94,31 @@ class MetaJob:
 			"additional_entry": self.additional_entry,
 			"dispatched_at": float(self.dispatched_at),
 		}
+		if _ORJSON_AVAILABLE:
+			try:
+				return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+			except TypeError:
+				pass  # e.g. ints wider than 64 bits; json handles those
 		return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
 
+# orjson reads integers wider than 64 bits as floats, silently losing
+# precision; any 20+ digit run sends the payload to the stdlib parser.
+_LONG_DIGITS_RE = re.compile(rb"[0-9]{20}")
+
+
+def json_loads(payload: bytes) -> Any:
+	"""Parse a UTF-8 JSON document, using orjson when it is lossless."""
+	if _ORJSON_AVAILABLE and _LONG_DIGITS_RE.search(payload) is None:
+		try:
+			return orjson.loads(payload)
+		except orjson.JSONDecodeError:
+			pass  # e.g. NaN/Infinity, which json accepts
+	return json.loads(payload)
+
+
 def parse_meta_job(payload: bytes) -> MetaJob:
-	obj = json.loads(payload.decode("utf-8"))
+	obj = json_loads(payload)
 	if not isinstance(obj, dict):
 		raise ValueError("job payload must be a JSON object")
 	version = int(obj.get("version") or 1)
@@ -10,6 +10,7 @@ import sys
 from typing import Any, Dict
 
 import boto3
+from botocore.config import Config
 
 import meta
 from screenshot_job import TempSpaceExceededError, render_one_wad_screenshots
@@ -69,10 +70,17 @@ def main() -> int:
 	default_panorama = _env_bool("DORCH_PANORAMA", False)
 	wadinfo_base_url = _env_str("WADINFO_BASE_URL", "http://localhost:8000")
 
+	# Downloads run ranged GETs concurrently through this client; keep its
+	# pool at least that wide so connections are reused, not renegotiated.
 	s3_wads = boto3.client(
 		"s3",
 		endpoint_url=wad_endpoint,
 		region_name=region_name,
+		config=Config(
+			max_pool_connections=max(_env_int("DORCH_S3_POOL", 32), meta.S3_RANGE_CONCURRENCY),
+			retries={"max_attempts": 5, "mode": "adaptive"},
+			tcp_keepalive=True,
+		),
 	)
 
 	try:
@@ -7,7 +7,6 @@ import asyncio
 import contextlib
 import json
 import os
-import re
 import signal
 import sys
 import tempfile
@@ -209,8 +208,11 @@ def _env_str(name: str, default: str) -> str:
 	return (v.strip() if v is not None else "") or default
 
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
 def _valid_sha1(s: str) -> bool:
-	return bool(re.fullmatch(r"[0-9a-f]{40}", (s or "").lower()))
+	return isinstance(s, str) and len(s) == 40 and _HEX_DIGITS.issuperset(s)
 
 
 def _valid_uuid(s: str) -> bool:
@@ -502,9 +504,12 @@ def signal_ready() -> None:
 	ready_file = os.getenv("DORCH_READY_FILE")
 	if ready_file:
 		try:
-			with open(ready_file, "w", encoding="utf-8") as f:
-				f.write(f"ready {time.time()}\n")
-		except Exception as ex:
+			fd = os.open(ready_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+			try:
+				os.write(fd, f"ready {time.time()}\n".encode())
+			finally:
+				os.close(fd)
+		except OSError as ex:
 			meta.eprint(f"Could not write ready file {ready_file}: {type(ex).__name__}: {ex}")
 
 
@@ -538,17 +543,11 @@ def render_one_wad_screenshots(
 	s3_key = meta.resolve_s3_key(s3_wads, wad_bucket, sha1, ext)
 
 	with tempfile.TemporaryDirectory(prefix="dorch_img_") as td:
-		gz_path = os.path.join(td, f"{sha1}.{ext}.gz")
 		file_path = os.path.join(td, f"{sha1}.{ext}")
 		output_path = os.path.join(td, "output_screenshots")
 
-		meta.download_s3_to_path(s3_wads, wad_bucket, s3_key, gz_path)
-		meta.gunzip_file(gz_path, file_path)
-		# Reduce peak temp usage: after gunzip succeeds, the .gz is no longer needed.
-		try:
-			os.unlink(gz_path)
-		except OSError:
-			pass
+		# Gunzipped while streaming, so the .gz never takes temp space.
+		meta.download_s3_gunzipped_to_path(s3_wads, wad_bucket, s3_key, file_path)
 
 		# IWAD selection
 		wad_type_upper = str(wad_entry.get("type") or "").upper()
@@ -835,7 +834,7 @@ def main() -> None:
 	ap.add_argument(
 		"--fetch-timeout",
 		type=float,
-		default=float(os.getenv("DORCH_IMAGES_FETCH_TIMEOUT", "1.0")),
+		default=float(os.getenv("DORCH_IMAGES_FETCH_TIMEOUT", "5.0")),
 		help="Fetch timeout seconds",
 	)
 	args = ap.parse_args()
@@ -27,7 +27,7 @@ def _fmt_bytes(n: int) -> str:
 	return f"{n:.1f} TiB"
 
 
-def _log_temp_space_context(*, temp_dir: str, gz_path: str, file_path: str) -> None:
+def _log_temp_space_context(*, temp_dir: str, file_path: str) -> None:
 	# Best-effort debug logging to understand if this is a real ephemeral-storage
 	# constraint (common in k8s) vs. a leak elsewhere.
 	try:
@@ -38,13 +38,10 @@ def _log_temp_space_context(*, temp_dir: str, gz_path: str, file_path: str) -> N
 			f"used={_fmt_bytes(int(usage.used))} free={_fmt_bytes(int(usage.free))}",
 			file=sys.stderr,
 		)
-		exists_gz = os.path.exists(gz_path)
 		exists_file = os.path.exists(file_path)
-		gz_size = os.path.getsize(gz_path) if exists_gz else -1
 		file_size = os.path.getsize(file_path) if exists_file else -1
 		print(
-			f"tmp artifacts: gz_exists={exists_gz} gz_size={_fmt_bytes(int(gz_size)) if gz_size >= 0 else '?'} "
-			f"file_exists={exists_file} file_size={_fmt_bytes(int(file_size)) if file_size >= 0 else '?'}",
+			f"tmp artifacts: file_exists={exists_file} file_size={_fmt_bytes(int(file_size)) if file_size >= 0 else '?'}",
 			file=sys.stderr,
 		)
 	except Exception:
@@ -73,10 +70,12 @@ def _valid_uuid(v: str) -> bool:
 		return False
 
 
-def _valid_sha1(v: str) -> bool:
-	import re
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
 
-	return bool(re.fullmatch(r"[0-9a-f]{40}", (v or "").strip().lower()))
+def _valid_sha1(v: str) -> bool:
+	v = (v or "").strip()
+	return len(v) == 40 and _HEX_DIGITS.issuperset(v)
 
 
 def _wad_entry_from_wadinfo_meta(wad_meta: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
@@ -201,28 +200,21 @@ def render_one_wad_screenshots(
 	# Use the process temp dir (TMPDIR) so deployments can choose where temp
 	# storage lives (e.g. tmpfs via emptyDir{medium: Memory}).
 	with tempfile.TemporaryDirectory(prefix="dorch_img_") as td:
-		gz_path = os.path.join(td, f"{sha1}.{ext}.gz")
 		file_path = os.path.join(td, f"{sha1}.{ext}")
 		output_path = os.path.join(td, "output_screenshots")
 
 		try:
-			meta.download_s3_to_path(s3_wads, wad_bucket, s3_key, gz_path)
-			meta.gunzip_file(gz_path, file_path)
-			# Reduce peak temp usage: after gunzip succeeds, the .gz is no longer needed.
-			try:
-				os.unlink(gz_path)
-			except OSError:
-				pass
+			# Gunzipped while streaming, so the .gz never takes temp space.
+			meta.download_s3_gunzipped_to_path(s3_wads, wad_bucket, s3_key, file_path)
 		except OSError as ex:
 			# Most common when tmpfs/ephemeral is intentionally capped.
 			if getattr(ex, "errno", None) == 28:
-				_log_temp_space_context(temp_dir=td, gz_path=gz_path, file_path=file_path)
+				_log_temp_space_context(temp_dir=td, file_path=file_path)
 				# Try to free any partial artifacts before raising (best-effort).
-				for p in (file_path, gz_path):
-					try:
-						os.unlink(p)
-					except OSError:
-						pass
+				try:
+					os.unlink(file_path)
+				except OSError:
+					pass
 				raise TempSpaceExceededError("temporary storage exhausted while downloading/unpacking") from ex
 			raise
 
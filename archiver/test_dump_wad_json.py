@@ -0,0 +1,119 @@
+import importlib.util
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+_spec = importlib.util.spec_from_file_location(
+    "dump_wad_json", os.path.join(os.path.dirname(__file__), "dump_wad_json.py")
+)
+dump_wad_json = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dump_wad_json)
+
+
+def _name8(s: str) -> bytes:
+    return s.encode("ascii").ljust(8, b"\x00")[:8]
+
+
+def _build_wad(lumps: list[tuple[str, bytes]]) -> bytes:
+    # Minimal PWAD builder: header + concatenated lump data + directory.
+    data_parts: list[bytes] = []
+    entries: list[tuple[int, int, str]] = []
+
+    off = 12
+    for name, data in lumps:
+        entries.append((off, len(data), name))
+        data_parts.append(data)
+        off += len(data)
+
+    dir_bytes = b"".join(
+        struct.pack("<II8s", e_off, e_size, _name8(e_name)) for (e_off, e_size, e_name) in entries
+    )
+    header = struct.pack("<4sii", b"PWAD", len(entries), off)
+    return header + b"".join(data_parts) + dir_bytes
+
+
+def _thing(ttype: int, flags: int) -> bytes:
+    return struct.pack("<hhhhh", 0, 0, 0, ttype, flags)
+
+
+def _linedef(special: int) -> bytes:
+    return struct.pack("<hhhhhhh", 0, 1, 0, special, 0, 0, -1)
+
+
+class TestDumpWadJson(unittest.TestCase):
+    def _run(self, lumps: list[tuple[str, bytes]]) -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            wad_path = os.path.join(tmp, "test.wad")
+            out_path = os.path.join(tmp, "out.json")
+            with open(wad_path, "wb") as f:
+                f.write(_build_wad(lumps))
+            dump_wad_json.run(wad_path, out_path)
+            with open(out_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+    def test_doom_map_summary(self) -> None:
+        things = b"".join(
+            [
+                _thing(3001, 0b111),  # imp, all skills
+                _thing(3001, 0b100),  # imp, UV only
+                _thing(9, 0b011),     # shotgun guy, HNTR + HMP
+                _thing(5, 0b111),     # blue key
+                _thing(40, 0b111),    # blue skull
+                _thing(1, 0b111),     # player start
+            ]
+        )
+        linedefs = b"".join([_linedef(0), _linedef(97), _linedef(0)])
+        out = self._run(
+            [
+                ("MAP01", b""),
+                ("THINGS", things),
+                ("LINEDEFS", linedefs),
+                ("SIDEDEFS", b"\x00" * 30),
+                ("VERTEXES", b"\x00" * 8),
+                ("SECTORS", b"\x00" * 26),
+            ]
+        )
+
+        self.assertEqual(out["type"], "PWAD")
+        self.assertEqual(len(out["maps"]), 1)
+        m = out["maps"][0]
+        self.assertEqual(m["map"], "MAP01")
+        self.assertEqual(m["format"], "doom")
+        self.assertEqual(m["stats"]["things"], 6)
+        self.assertEqual(m["stats"]["linedefs"], 3)
+        self.assertEqual(m["stats"]["vertices"], 2)
+        self.assertEqual(m["monsters"], {"total": 3, "by_type": {"imp": 2, "shotgun_guy": 1}})
+        self.assertEqual(m["mechanics"], {"teleports": True, "keys": ["blue", "blue_skull"], "secret_exit": False})
+        self.assertEqual(m["difficulty"], {"uv_monsters": 2, "hmp_monsters": 2, "htr_monsters": 2})
+
+    def test_map_blocks_and_secret_exit(self) -> None:
+        out = self._run(
+            [
+                ("E1M1", b""),
+                ("THINGS", _thing(3004, 0b001)),
+                ("LINEDEFS", _linedef(51)),
+                ("E1M2", b""),
+                ("THINGS", b""),
+                ("LINEDEFS", b"\x00" * 5),  # not a whole number of records
+                ("ENDOOM", b"\x00" * 10),
+            ]
+        )
+
+        self.assertEqual([m["map"] for m in out["maps"]], ["E1M1", "E1M2"])
+        e1m1, e1m2 = out["maps"]
+        self.assertTrue(e1m1["mechanics"]["secret_exit"])
+        self.assertFalse(e1m1["mechanics"]["teleports"])
+        self.assertEqual(e1m1["monsters"]["by_type"], {"zombieman": 1})
+        self.assertEqual(e1m2["format"], "unknown")
+        self.assertEqual(e1m2["monsters"]["total"], 0)
+        self.assertFalse(e1m2["mechanics"]["secret_exit"])
+
+    def test_wad_without_maps(self) -> None:
+        self.assertEqual(self._run([("DEHACKED", b"Patch File for DeHackEd\n")])["maps"], [])
+        self.assertEqual(self._run([])["maps"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
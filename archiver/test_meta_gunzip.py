@@ -0,0 +1,42 @@
+import gzip
+import io
+import os
+import sys
+import unittest
+
+# Ensure archiver/ is importable (meta-worker imports `meta` from this directory).
+sys.path.insert(0, os.path.dirname(__file__))
+
+import meta  # noqa: E402
+
+
+def _gunzip(data: bytes, chunk_size: int) -> bytes:
+    out = io.BytesIO()
+    meta.gunzip_chunks((data[i : i + chunk_size] for i in range(0, len(data), chunk_size)), out)
+    return out.getvalue()
+
+
+class TestGunzipChunks(unittest.TestCase):
+    def test_matches_gzip(self) -> None:
+        one = gzip.compress(b"hello" * 100)
+        two = gzip.compress(b"world" * 100)
+        cases = [
+            one,
+            one + two,
+            one + b"\x00" * 8,
+            one + b"\x00" * 8 + two,
+            one + b"\x00" * 8 + two + b"\x00" * 3,
+        ]
+        for data in cases:
+            for chunk_size in (1, 7, len(one), len(data)):
+                with self.subTest(size=len(data), chunk_size=chunk_size):
+                    self.assertEqual(_gunzip(data, chunk_size), gzip.decompress(data))
+
+    def test_truncated(self) -> None:
+        data = gzip.compress(b"hello" * 100)
+        with self.assertRaises(EOFError):
+            _gunzip(data[:-4], 16)
+
+
+if __name__ == "__main__":
+    unittest.main()